@@ -3,6 +3,7 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 
 from app.config import Config
+from app.utils.metrics import init_metrics
 from app.controllers.class_controller import class_bp
 from app.controllers.teacher_controller import teacher_bp
 from app.controllers.availability_controller import availability_bp
@@ -29,6 +30,9 @@ def create_app():
     # Initialize JWT
     jwt = JWTManager(app)
 
+    # Request latency metrics and the /metrics endpoint
+    init_metrics(app)
+
     @app.route("/")
     def home():
         return "Hello from Flask on Vercel!"
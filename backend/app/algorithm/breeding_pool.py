@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import random
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.algorithm.chromosome import Chromosome
+from app.algorithm.solver_context import SolverContext
+
+# Per-process worker state, set up once by _init_worker
+_worker: Dict[str, Any] = {}
+
+
+def pack_genomes(chromosomes: List[Chromosome]) -> bytes:
+    return b"".join(c.genome.tobytes() for c in chromosomes)
+
+
+def unpack_genomes(context: SolverContext, typecode: str, data: bytes, points: Optional[List[int]] = None) -> List[Chromosome]:
+    # Without points the chromosomes are fully evaluated (occupancy built);
+    # with points they are scored lazily.
+    config = context.config
+    genomes = array(typecode)
+    genomes.frombytes(data)
+    size = config.nostudentgroup * config.daysperweek * config.hoursperday
+    if size == 0:
+        return []
+
+    chromosomes = []
+    for k in range(0, len(genomes), size):
+        if points is None:
+            chromosomes.append(Chromosome(context, genome=genomes[k:k + size]))
+        else:
+            c = Chromosome(context, evaluate=False, genome=genomes[k:k + size])
+            c.set_point(points[k // size])
+            chromosomes.append(c)
+    return chromosomes
+
+
+def _init_worker(context: SolverContext, settings: Dict[str, Any], stop: Any):
+    from app.algorithm.scheduler_main import SchedulerMain
+
+    # stop is a process-shared event the parent sets on cancel; breed()
+    # polls it after every child like a local cancel_event.
+    scheduler = SchedulerMain(context, run=False, cancel_event=stop, **settings)
+    _worker["scheduler"] = scheduler
+    _worker["round"] = None
+
+
+def _breed_chunk(
+    round_id: int, typecode: str, elite_genomes: bytes, count: int, seed: int, deadline: Optional[float]
+) -> Tuple[bytes, List[int], Dict[str, Any]]:
+    scheduler = _worker["scheduler"]
+
+    # deadline is wall-clock time (shared across processes); the worker
+    # stops breeding at it just as the parent's out_of_time would.
+    scheduler.started_at = time.perf_counter()
+    scheduler.time_budget = None if deadline is None else max(0.0, deadline - time.time())
+
+    # The elite set only changes once per generation, so it is decoded (and
+    # its occupancy rebuilt) once per worker per generation.
+    if _worker["round"] != round_id:
+        scheduler.first_list = unpack_genomes(scheduler.context, typecode, elite_genomes)
+        _worker["round"] = round_id
+
+    random.seed(seed)
+    prof = scheduler.profile
+    cache = scheduler.fitness_cache
+    attempts = scheduler.mutation_attempts
+    profile_counts = dict(prof.counters) if prof is not None else None
+    if cache is not None:
+        hits, misses = cache.hits, cache.misses
+
+    children = scheduler.breed(count)
+
+    # Work done in this process, added to the parent's totals by breed().
+    counters: Dict[str, Any] = {"mutation_attempts": scheduler.mutation_attempts - attempts}
+    if prof is not None:
+        counters["profile"] = {
+            name: value - profile_counts.get(name, 0) for name, value in prof.counters.items()
+        }
+    if cache is not None:
+        counters["cache"] = {
+            "worker": os.getpid(),
+            "hits": cache.hits - hits,
+            "misses": cache.misses - misses,
+            "entries": len(cache.entries),
+        }
+    return pack_genomes(children), [c.point for c in children], counters
+
+
+class BreedingPool:
+    """Breeds the non-elite children of a generation in worker processes.
+
+    Each task receives the elite genomes of the current generation and
+    returns compact child genomes with their penalty points, plus the
+    worker's counters for the parent scheduler's totals. Workers stop
+    at the scheduler's time budget, and within one child of a cancel.
+    """
+
+    def __init__(self, scheduler: Any):
+        self.scheduler = scheduler
+        self.context = scheduler.context
+        self.workers = scheduler.workers
+        self.chunk_size = scheduler.chunk_size
+        self._round = 0
+        self.stop = multiprocessing.Event()
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.context, scheduler.breeding_settings(), self.stop),
+        )
+
+    def breed(self, elite: List[Chromosome], count: int) -> List[Chromosome]:
+        if not elite or count <= 0:
+            return []
+
+        self._round += 1
+        typecode = elite[0].genome.typecode
+        elite_genomes = pack_genomes(elite)
+        chunk = self.chunk_size or -(-count // self.workers)
+        scheduler = self.scheduler
+        deadline = None
+        if scheduler.time_budget is not None:
+            deadline = time.time() + scheduler.time_budget - (time.perf_counter() - scheduler.started_at)
+
+        futures = []
+        remaining = count
+        while remaining > 0:
+            n = min(chunk, remaining)
+            futures.append(self.executor.submit(
+                _breed_chunk, self._round, typecode, elite_genomes, n, random.getrandbits(32), deadline
+            ))
+            remaining -= n
+
+        # Forward a cancel to the workers while their chunks run.
+        pending = set(futures)
+        while pending:
+            if scheduler.stop_requested():
+                self.stop.set()
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+
+        children = []
+        for future in futures:
+            data, points, counters = future.result()
+            children.extend(unpack_genomes(self.context, typecode, data, points))
+            self._merge_counters(counters)
+        return children
+
+    def _merge_counters(self, counters: Dict[str, Any]):
+        scheduler = self.scheduler
+        scheduler.mutation_attempts += counters["mutation_attempts"]
+        if scheduler.profile is not None:
+            for name, value in counters["profile"].items():
+                scheduler.profile.count(name, value)
+        if scheduler.fitness_cache is not None:
+            cache = counters["cache"]
+            scheduler.fitness_cache.merge_worker(cache["worker"], cache["hits"], cache["misses"], cache["entries"])
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
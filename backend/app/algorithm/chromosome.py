@@ -1,15 +1,16 @@
-import copy
-from typing import List, Dict, Any, Optional
-from app.algorithm.gene import Gene
-from app.algorithm.input_data import InputData
-from app.algorithm.time_table import TimeTable
-from app.algorithm.time_table_storing_service import store_time_table
-from app.services.availability_update_service import update_availability_after_timetable
+from array import array
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple
+from app.algorithm.fitness_cache import row_hash
+from app.algorithm.gene import Gene, slot_typecode
+from app.algorithm.solver_context import SolverContext
+from app.algorithm.time_table_storing_service import save_time_table
 
 class Chromosome:   
-    def __init__(self, config: InputData):
-        self.config = config
-        self.timetable_data = config
+    def __init__(self, context: SolverContext, evaluate: bool = True, genome: Optional[array] = None):
+        self.context = context
+        self.config = context.config
+        self.timetable_data = context.config
+        self.slots = context.slots
         
         self.crossover_rate = self.timetable_data.crossover_rate
         self.mutation_rate = self.timetable_data.mutation_rate
@@ -19,73 +20,249 @@ class Chromosome:
         self.nostgrp = self.timetable_data.nostudentgroup
         
         self.total_slots = self.days * self.hours
-        self.gene = []
+        self.noteacher = len(self.timetable_data.teacher)
 
-        for group_index in range(self.nostgrp):
-            self.gene.append(Gene(group_index, self.timetable_data))
+        # Flat genome: genome[group_index * total_slots + pos] is the
+        # slot table index placed at week position pos for that group.
+        if genome is not None:
+            self.genome = genome
+        else:
+            self.genome = array(slot_typecode(len(self.slots)))
+            for group_index in range(self.nostgrp):
+                self.genome.extend(Gene(group_index, context).slotno)
 
-        self.fitness = self.get_fitness()
+        worst_conflict_penalty = (self.nostgrp - 1) * self.total_slots * 250
+        worst_unavail_penalty = self.noteacher * self.total_slots * 700
+        self.max_conflicts = max(1.0, worst_conflict_penalty + worst_unavail_penalty)
+
+        self.occupancy = None
+        self.point = 0
+        self.fitness = 0.0
+        # Per-group row hashes for genome_key, built on first use; rows
+        # changed since are re-hashed lazily.
+        self.row_hashes: Optional[List[int]] = None
+        self.dirty_rows: Set[int] = set()
+        self.genome_hash = 0
+        if evaluate:
+            self.get_fitness()
 
     def deep_clone(self) -> 'Chromosome':
-        return copy.deepcopy(self)
+        # The solver context is shared by reference; only the genome and
+        # occupancy buffers are copied.
+        clone = Chromosome.__new__(Chromosome)
+        clone.__dict__.update(self.__dict__)
+        clone.genome = self.genome[:]
+        if self.occupancy is not None:
+            clone.occupancy = self.occupancy[:]
+        if self.row_hashes is not None:
+            clone.row_hashes = self.row_hashes[:]
+            clone.dirty_rows = set(self.dirty_rows)
+        return clone
+
+    def row(self, group_index: int) -> array:
+        start = group_index * self.total_slots
+        return self.genome[start:start + self.total_slots]
+
+    def genome_key(self) -> int:
+        # XOR of the per-group row hashes (see FitnessCache).
+        if self.row_hashes is None:
+            self.row_hashes = [row_hash(g, self.row(g)) for g in range(self.nostgrp)]
+            self.dirty_rows = set()
+            self.genome_hash = 0
+            for h in self.row_hashes:
+                self.genome_hash ^= h
+        elif self.dirty_rows:
+            for g in self.dirty_rows:
+                h = row_hash(g, self.row(g))
+                self.genome_hash ^= self.row_hashes[g] ^ h
+                self.row_hashes[g] = h
+            self.dirty_rows.clear()
+        return self.genome_hash
+
+    def child_key(self, group_index: int, row: array) -> int:
+        # genome_key of this chromosome with row as gene group_index.
+        key = self.genome_key()
+        return key ^ self.row_hashes[group_index] ^ row_hash(group_index, row)
 
     def get_fitness(self) -> float:
+        # Full rebuild of the per-slot teacher occupancy counts.
+        # occupancy[i * noteacher + teacher_id] is the number of groups that
+        # have that teacher in week slot i.
         self.point = 0
+        self.occupancy = array('H', [0]) * (self.total_slots * self.noteacher)
 
-        
+        for j in range(self.nostgrp):
+            self._apply_gene(j, 1)
+
+        return self._update_fitness()
+
+    def set_point(self, point: int, occupancy: Optional[array] = None) -> float:
+        # Used by batched evaluators; without occupancy it is rebuilt lazily
+        # when the chromosome is first modified.
+        self.point = point
+        self.occupancy = occupancy
+        return self._update_fitness()
+
+    def replace_gene(self, group_index: int, slotno: Sequence[int]) -> float:
+        # Only the slots of this group change, so the penalty is updated
+        # incrementally instead of rescanning every group.
+        if self.occupancy is None:
+            self.get_fitness()
+
+        start = group_index * self.total_slots
+        self._apply_gene(group_index, -1)
+        self.genome[start:start + self.total_slots] = array(self.genome.typecode, slotno)
+        if self.row_hashes is not None:
+            self.dirty_rows.add(group_index)
+        self._apply_gene(group_index, 1)
+
+        return self._update_fitness()
+
+    def swap_slots(self, group_index: int, pos1: int, pos2: int) -> float:
+        # Swapping two periods of one group only touches those two week slots.
+        if self.occupancy is None:
+            self.get_fitness()
+        if pos1 == pos2:
+            return self.fitness
+
+        start = group_index * self.total_slots
+        genome = self.genome
+        if self.row_hashes is not None:
+            self.dirty_rows.add(group_index)
+        self._apply_slot(pos1, genome[start + pos1], -1)
+        self._apply_slot(pos2, genome[start + pos2], -1)
+        genome[start + pos1], genome[start + pos2] = genome[start + pos2], genome[start + pos1]
+        self._apply_slot(pos1, genome[start + pos1], 1)
+        self._apply_slot(pos2, genome[start + pos2], 1)
+
+        return self._update_fitness()
+
+    def conflict_positions(self, group_index: int) -> List[int]:
+        # Week positions of this group whose teacher is unavailable or is
+        # also teaching another group at the same time.
+        if self.occupancy is None:
+            self.get_fitness()
+
+        start = group_index * self.total_slots
+        slot_teacher = self.context.slot_teacher
+        unavailable = self.context.unavailable_mask
+        occupancy = self.occupancy
+        noteacher = self.noteacher
+        genome = self.genome
+        positions = []
         for i in range(self.total_slots):
-            teacher_list = []
+            teacher_id = slot_teacher[genome[start + i]]
+            if teacher_id < 0:
+                continue
+            if occupancy[i * noteacher + teacher_id] > 1 or unavailable[teacher_id] >> i & 1:
+                positions.append(i)
+        return positions
 
-            
-            for j in range(self.nostgrp):
-                slot_index = self.gene[j].slotno[i]
+    def conflict_report(self) -> List[Dict[str, Any]]:
+        # Remaining conflicts as group name, week position, subject and teacher.
+        report = []
+        for g in range(self.nostgrp):
+            start = g * self.total_slots
+            for pos in self.conflict_positions(g):
+                current_slot = self.slots[self.genome[start + pos]]
+                report.append({
+                    "group": current_slot.student_group.name,
+                    "position": pos,
+                    "subject": str(current_slot.subject),
+                    "teacher": self.timetable_data.teacher[current_slot.teacher_id].name,
+                })
+        return report
+
+    def _apply_gene(self, group_index: int, sign: int):
+        genome = self.genome
+        start = group_index * self.total_slots
 
-                
-                if slot_index is None or slot_index >= len(TimeTable.slot) or slot_index < 0:
-                    continue
+        for i in range(self.total_slots):
+            self._apply_slot(i, genome[start + i], sign)
 
-                current_slot = TimeTable.slot[slot_index]
-                if current_slot is None:
-                    continue
+    def _apply_slot(self, pos: int, slot_index: int, sign: int):
+        teacher_id = self.context.slot_teacher[slot_index]
+        if teacher_id < 0:
+            return
 
-                teacher_id = current_slot.teacher_id
+        # A teacher in an unavailable slot costs 4000, and every group
+        # beyond the first sharing a teacher in the same slot costs 4000.
+        if self.context.unavailable_mask[teacher_id] >> pos & 1:
+            self.point += sign * 4000
 
-                
-                if teacher_id is None or teacher_id >= len(self.timetable_data.teacher):
-                    continue
+        occupancy = self.occupancy
+        cell = pos * self.noteacher + teacher_id
+        if sign > 0:
+            if occupancy[cell] > 0:
+                self.point += 4000
+            occupancy[cell] += 1
+        else:
+            occupancy[cell] -= 1
+            if occupancy[cell] > 0:
+                self.point -= 4000
 
-                teacher_obj = self.timetable_data.teacher[teacher_id]
+    def is_lab_slot(self, slot_index: int) -> bool:
+        return self.context.timetable.lab_slot[slot_index]
 
-                
-                if hasattr(teacher_obj, 'unavailable_slots') and i in teacher_obj.unavailable_slots:
-                    self.point += 4000
+    def lab_block(self, group_index: int, pos: int) -> Tuple[int, int]:
+        # First and last week position of the lab block covering pos.
+        start = group_index * self.total_slots
+        genome = self.genome
+        subject = self.slots[genome[start + pos]].subject
 
-                
-                if teacher_id in teacher_list:
-                    self.point += 4000
-                else:
-                    teacher_list.append(teacher_id)
+        def same_subject(p):
+            current_slot = self.slots[genome[start + p]]
+            return current_slot is not None and current_slot.subject == subject
 
-        worst_conflict_penalty = (self.nostgrp - 1) * self.total_slots * 250
-        worst_unavail_penalty = len(self.timetable_data.teacher) * self.total_slots * 700
-        max_conflicts = max(1.0, worst_conflict_penalty + worst_unavail_penalty)
+        first = pos
+        while first > 0 and same_subject(first - 1):
+            first -= 1
+        last = pos
+        while last < self.total_slots - 1 and same_subject(last + 1):
+            last += 1
+        return first, last
+
+    def lab_block_targets(self, group_index: int, first: int, last: int) -> List[int]:
+        # Start positions the block first..last can be swapped to: same
+        # placement rules as Gene (within the day, not straddling lunch),
+        # not overlapping itself or another lab period.
+        start = group_index * self.total_slots
+        m = last - first + 1
+        hours = self.hours
+        lunch = self.timetable_data.lunch_hour
+        targets = []
+        for t in range(self.total_slots - m + 1):
+            day_hour = t % hours
+            if day_hour >= hours - m or (day_hour < lunch and day_hour + m > lunch):
+                continue
+            if t <= last and t + m - 1 >= first:
+                continue
+            if any(self.is_lab_slot(self.genome[start + q]) for q in range(t, t + m)):
+                continue
+            targets.append(t)
+        return targets
 
-        self.fitness = 1.0 - (self.point / max_conflicts)
-        if self.fitness < 0:
-            self.fitness = 0.0
+    def fitness_for(self, point: int) -> float:
+        fitness = 1.0 - (point / self.max_conflicts)
+        if fitness < 0:
+            fitness = 0.0
 
+        return fitness
+
+    def _update_fitness(self) -> float:
+        self.fitness = self.fitness_for(self.point)
         return self.fitness
 
     
-    def print_time_table(self):
-        import json
+    def to_time_table_dict(self) -> Dict[str, Dict[str, List[int]]]:
+        # group name -> subject -> week positions
         timetable_dict = {}
         for i in range(self.nostgrp):
             
             group_name = "Unknown Group"
             for l in range(self.total_slots):
-                slot_index = self.gene[i].slotno[l]
-                current_slot = TimeTable.slot[slot_index]
+                slot_index = self.genome[i * self.total_slots + l]
+                current_slot = self.slots[slot_index]
                 if current_slot is not None:
                     group_name = current_slot.student_group.name
                     break
@@ -93,25 +270,28 @@ class Chromosome:
             
             subject_positions = {}
             for pos in range(self.total_slots):
-                slot_index = self.gene[i].slotno[pos]
-                current_slot = TimeTable.slot[slot_index]
+                slot_index = self.genome[i * self.total_slots + pos]
+                current_slot = self.slots[slot_index]
                 if current_slot is not None and hasattr(current_slot, 'subject') and current_slot.subject:
                     subj = str(current_slot.subject)
                     subject_positions.setdefault(subj, []).append(pos)
 
             timetable_dict[group_name] = subject_positions
-        print(timetable_dict)
-        print(store_time_table(timetable_dict))
-        
-        # Update availability after timetable creation
-        availability_update_result = update_availability_after_timetable()
-        print("Availability update result:", availability_update_result)
+        return timetable_dict
+
+    def print_time_table(self) -> Dict[str, Dict[str, List[int]]]:
+        timetable_dict = self.to_time_table_dict()
+        save_time_table(timetable_dict)
+        return timetable_dict
 
     def print_chromosome(self):
         for i in range(self.nostgrp):
-            raw_gene_data = [str(self.gene[i].slotno[j]) for j in range(self.total_slots)]
+            raw_gene_data = [str(slot_index) for slot_index in self.row(i)]
             
         
     
     def __lt__(self, other: 'Chromosome') -> bool:
-        return self.fitness > other.fitness
\ No newline at end of file
+        # Populations are sorted with reverse=True, so this must be the
+        # natural order for the fittest chromosome to come first. Compared
+        # on points, since fitness is clamped to 0 on heavy-conflict inputs.
+        return self.point > other.point
\ No newline at end of file
@@ -0,0 +1,64 @@
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def row_hash(group_index: int, row: array) -> int:
+    # One term of a genome's hash; Chromosome.genome_key XORs them over all
+    # groups, so replacing a gene only re-hashes that row.
+    return hash((group_index, row.tobytes()))
+
+
+class FitnessCache:
+    """Bounded LRU map from genome hash to penalty points.
+
+    The points are the whole conflict breakdown the GA keeps (4000 per
+    clash or unavailable period); fitness is derived from them by the
+    chromosome. Keys are 64-bit hashes, so a collision is possible but
+    vanishingly unlikely at these sizes.
+
+    With a breeding pool every worker process has its own cache; the
+    parent's copy only aggregates their lookups (see merge_worker).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self.entries: "OrderedDict[int, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Latest entry count of each worker process's cache
+        self.worker_entries: Dict[int, int] = {}
+
+    def get(self, key: int) -> Optional[int]:
+        point = self.entries.get(key)
+        if point is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return point
+
+    def put(self, key: int, point: int):
+        self.entries[key] = point
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def merge_worker(self, worker: int, hits: int, misses: int, entries: int):
+        self.hits += hits
+        self.misses += misses
+        self.worker_entries[worker] = entries
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries) + sum(self.worker_entries.values()),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
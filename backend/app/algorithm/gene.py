@@ -1,47 +1,30 @@
-import copy
 import random
+from array import array
 from typing import List, Any
-from app.algorithm.input_data import InputData
-from app.algorithm.time_table import TimeTable
+
+def slot_typecode(slot_count: int) -> str:
+    # Genomes only hold slot table indices, so 16-bit entries are enough
+    # for up to 65535 slots (about 1800 groups of a 5x7 week).
+    return 'H' if slot_count <= 0xFFFF else 'I'
 
 class Gene:
     
-    slotno: List[int]
+    slotno: array
     
-    def __init__(self, group_index: int, config: Any):
+    def __init__(self, group_index: int, context: Any):
+        config = context.config
         self.days = config.daysperweek
         self.hours = config.hoursperday
         self.total_slots = self.days * self.hours
         
-        self.slotno: List[int] = [0] * self.total_slots
         slot_base_index = group_index * self.total_slots
-        local_indices = list(range(self.total_slots))
-
-        subject_to_offsets = {}
-        for local_offset in local_indices:
-            global_index = slot_base_index + local_offset
-            slot_obj = None
-            try:
-                slot_obj = TimeTable.slot[global_index]
-            except Exception:
-                slot_obj = None
-
-            subj_name = None
-            if slot_obj is not None and hasattr(slot_obj, 'subject') and slot_obj.subject:
-                subj_name = str(slot_obj.subject)
-            else:
-                subj_name = None
-
-            subject_to_offsets.setdefault(subj_name, []).append(local_offset)
-
-        blocks: List[List[int]] = []
-        singles: List[int] = []
+        local_indices = range(self.total_slots)
 
-        for subj, offsets in subject_to_offsets.items():
-            if subj is not None and subj.lower().endswith('_lab') and len(offsets) > 0:
-                blocks.append(list(offsets))
-            else:
-                singles.extend(offsets)
+        # Lab blocks, single offsets and valid block starts are computed once
+        # per TimeTable; only the random placement happens here.
+        template = context.timetable.templates[group_index]
+        blocks = template.blocks[:]
+        singles = template.singles[:]
 
         random.shuffle(blocks)
         random.shuffle(singles)
@@ -50,29 +33,25 @@ class Gene:
         free_positions = set(range(self.total_slots))
 
         def find_block_position(m):
-            candidates = list(free_positions)
-            random.shuffle(candidates)
-
-            for pos in candidates:
-                day_hour = pos % self.hours
-
-                if day_hour >= self.hours - m:
-                    continue
-                
-                L = config.lunch_hour
-                crosses_lunch = (
-                    day_hour < L and day_hour + m > L
-                )
+            candidates = template.block_starts.get(m, [])
 
-                if crosses_lunch:
-                    continue
-
-                ok = True
+            def fits(pos):
                 for q in range(pos, pos + m):
                     if q not in free_positions:
-                        ok = False
-                        break
-                if ok:
+                        return False
+                return True
+
+            # Rejection sampling is uniform over the fitting starts and
+            # usually succeeds at once; fall back to a full shuffled scan.
+            for _ in range(len(candidates)):
+                pos = candidates[random.randrange(len(candidates))]
+                if fits(pos):
+                    return pos
+
+            candidates = candidates[:]
+            random.shuffle(candidates)
+            for pos in candidates:
+                if fits(pos):
                     return pos
             return None
 
@@ -102,24 +81,27 @@ class Gene:
                 placement[pos] = local_off
                 free_positions.remove(pos)
 
-        remaining_positions = list(free_positions)
-        random.shuffle(remaining_positions)
-        for pos, local_off in zip(remaining_positions, singles):
+        # singles is already shuffled, so pairing it with the free positions
+        # in order is a uniformly random placement.
+        for pos, local_off in zip(sorted(free_positions), singles):
             placement[pos] = local_off
 
-        assigned_local_offsets = set(x for x in placement if x is not None)
-        remaining_offsets = [o for o in local_indices if o not in assigned_local_offsets]
-        remaining_positions = [i for i, v in enumerate(placement) if v is None]
-        random.shuffle(remaining_offsets)
+        if None in placement:
+            assigned_local_offsets = set(x for x in placement if x is not None)
+            remaining_offsets = [o for o in local_indices if o not in assigned_local_offsets]
+            remaining_positions = [i for i, v in enumerate(placement) if v is None]
+            random.shuffle(remaining_offsets)
 
-        for pos, local_off in zip(remaining_positions, remaining_offsets):
-            placement[pos] = local_off
+            for pos, local_off in zip(remaining_positions, remaining_offsets):
+                placement[pos] = local_off
 
-        for j in range(self.total_slots):
-            local_offset = placement[j]
-            if local_offset is None:
-                local_offset = j
-            self.slotno[j] = slot_base_index + local_offset
+        self.slotno = array(slot_typecode(len(context.slots)), [
+            slot_base_index + (j if local_offset is None else local_offset)
+            for j, local_offset in enumerate(placement)
+        ])
 
     def deep_clone(self) -> 'Gene':
-        return copy.deepcopy(self)
\ No newline at end of file
+        clone = Gene.__new__(Gene)
+        clone.__dict__.update(self.__dict__)
+        clone.slotno = array(self.slotno.typecode, self.slotno)
+        return clone
\ No newline at end of file
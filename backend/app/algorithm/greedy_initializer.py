@@ -0,0 +1,122 @@
+import random
+from array import array
+from typing import List, Optional
+
+from app.algorithm.gene import slot_typecode
+from app.algorithm.solver_context import SolverContext
+
+
+def greedy_genome(
+    context: SolverContext,
+    base_genome: Optional[array] = None,
+    groups: Optional[List[int]] = None,
+) -> array:
+    """Builds a genome group by group against a shared teacher-occupancy table.
+
+    Groups are visited in random order. Each lab block goes to the valid start
+    (within the day, not straddling lunch) with the fewest teacher clashes
+    and unavailable periods, then each single period to the cheapest free
+    position, ties broken at random. With base_genome and groups, only those
+    groups are rebuilt; the others keep their genes from base_genome and
+    count as fixed occupancy.
+    """
+    config = context.config
+    total_slots = config.daysperweek * config.hoursperday
+    noteacher = len(config.teacher)
+    slots = context.slots
+    templates = context.timetable.templates
+
+    rebuild = list(groups) if groups is not None else list(range(config.nostudentgroup))
+    if base_genome is not None:
+        genome = base_genome[:]
+    else:
+        genome = array(slot_typecode(len(slots)), range(config.nostudentgroup * total_slots))
+
+    # busy[pos * noteacher + t]: groups already placed with teacher t at pos;
+    # unavailable periods start at 1 so they cost the same as a clash.
+    busy = [0] * (total_slots * noteacher)
+    for teacher_id, teacher in enumerate(config.teacher):
+        for s in teacher.unavailable_slots:
+            if 0 <= s < total_slots:
+                busy[s * noteacher + teacher_id] += 1
+
+    def teacher_of(slot_index):
+        current_slot = slots[slot_index]
+        if current_slot is None or current_slot.teacher_id is None or not 0 <= current_slot.teacher_id < noteacher:
+            return None
+        return current_slot.teacher_id
+
+    rebuilt = set(rebuild)
+    if base_genome is not None:
+        for g in range(config.nostudentgroup):
+            if g in rebuilt:
+                continue
+            start = g * total_slots
+            for pos in range(total_slots):
+                teacher_id = teacher_of(genome[start + pos])
+                if teacher_id is not None:
+                    busy[pos * noteacher + teacher_id] += 1
+
+    random.shuffle(rebuild)
+    for g in rebuild:
+        template = templates[g]
+        base = g * total_slots
+        placement: List[Optional[int]] = [None] * total_slots
+
+        blocks = template.blocks[:]
+        random.shuffle(blocks)
+        unplaced: List[int] = []
+        for block in blocks:
+            m = len(block)
+            teacher_ids = [teacher_of(base + offset) for offset in block]
+            best_cost = None
+            best_starts: List[int] = []
+            for pos in template.block_starts.get(m, []):
+                if any(placement[q] is not None for q in range(pos, pos + m)):
+                    continue
+                cost = sum(
+                    busy[(pos + k) * noteacher + t] for k, t in enumerate(teacher_ids) if t is not None
+                )
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_starts = cost, [pos]
+                elif cost == best_cost:
+                    best_starts.append(pos)
+            if not best_starts:
+                unplaced.extend(block)
+                continue
+            pos = random.choice(best_starts)
+            for k, offset in enumerate(block):
+                placement[pos + k] = offset
+                if teacher_ids[k] is not None:
+                    busy[(pos + k) * noteacher + teacher_ids[k]] += 1
+
+        singles = template.singles[:]
+        random.shuffle(singles)
+        free_periods = []
+        for offset in unplaced + singles:
+            teacher_id = teacher_of(base + offset)
+            if teacher_id is None:
+                free_periods.append(offset)
+                continue
+            best_cost = None
+            best_positions: List[int] = []
+            for pos in range(total_slots):
+                if placement[pos] is not None:
+                    continue
+                cost = busy[pos * noteacher + teacher_id]
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_positions = cost, [pos]
+                elif cost == best_cost:
+                    best_positions.append(pos)
+            pos = random.choice(best_positions)
+            placement[pos] = offset
+            busy[pos * noteacher + teacher_id] += 1
+
+        # Empty periods take whatever positions are left.
+        remaining = [pos for pos in range(total_slots) if placement[pos] is None]
+        for pos, offset in zip(remaining, free_periods):
+            placement[pos] = offset
+
+        genome[base:base + total_slots] = array(genome.typecode, [base + offset for offset in placement])
+
+    return genome
@@ -1,27 +1,12 @@
+import heapq
 import os
-from typing import List, Any
+from typing import List, Any, Dict, Iterable, Optional, Tuple
 import random 
 import re 
 
 from app.algorithm.student_group import StudentGroup
 from app.algorithm.teacher import Teacher
-
-class StudentGroup:
-    def __init__(self):
-        self.id = 0
-        self.name = ""
-        self.nosubject = 0
-        self.subject: List[str] = [''] * 10
-        self.teacher_id: List[int] = [0] * 10
-        self.hours: List[int] = [0] * 10
-
-class Teacher:
-    def __init__(self):
-        self.id = 0
-        self.name = ""
-        self.subject = ""
-        self.assigned = 0 
-        self.unavailable_slots: List[int] = [] 
+from app.algorithm.time_table_input_transform_service import combine_lab_availability
 
 class InputData:
     
@@ -38,9 +23,9 @@ class InputData:
 
     MAX_SIZE = 100 
     
-    def __init__(self, input_file_path: str = "input.txt"):
-        InputData.student_group = [] 
-        InputData.teacher = []
+    def __init__(self, input_file_path: str = "input.txt", payload: Optional[Dict[str, Any]] = None):
+        self.student_group = [] 
+        self.teacher = []
         
         self.input_file_path = input_file_path
         
@@ -48,16 +33,26 @@ class InputData:
         self.unavailability_data = {} 
         
         
-        self._take_input()
+        self.hoursperday = 7
+        self.daysperweek = 5
+        self.lunch_hour = 4
+
+        if payload is not None:
+            self._take_payload(payload)
+        else:
+            self._take_input()
+        self.nostudentgroup = len(self.student_group)
+        self.noteacher = len(self.teacher)
         self._assign_teacher() 
         self._merge_unavailability_data() 
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "InputData":
+        """Builds the input straight from a validated request payload (the
+        JSON transform_input accepts) without going through the file format."""
+        return cls(payload=payload)
     
     def _take_input(self):
-    
-        InputData.hoursperday = 7
-        InputData.daysperweek = 5
-        InputData.lunch_hour = 4
-
         try:
             file_path = self.input_file_path
             
@@ -65,8 +60,6 @@ class InputData:
                 lines = file.readlines()
 
             mode = None
-            student_group_index = 0
-            teacher_index = 0
             
             for line in lines:
                 line = line.strip()
@@ -87,67 +80,65 @@ class InputData:
                     parts = line.split()
                     if len(parts) < 2: continue
 
-                    teacher = Teacher() 
-                    teacher.id = teacher_index
-                    teacher.name = parts[0]
-                    teacher.subject = parts[1]
-                    
-                    InputData.teacher.append(teacher)
-                    teacher_index += 1
+                    # "name subject[, subject...]"
+                    subjects = [sub.strip() for sub in " ".join(parts[1:]).split(",")]
+                    self._add_teacher(parts[0], [sub for sub in subjects if sub])
                 
                 elif mode == "studentgroups":
                     
                     parts = line.split()
                     if not parts: continue
                         
-                    sg = StudentGroup()
-                    sg.id = student_group_index
-                    sg.name = parts[0]
-                    
-                    j = 0
                     subject_data = parts[1:]
-                    for sub, hrs in zip(subject_data[::2], subject_data[1::2]):
-                        if j < 10: 
-                            sg.subject[j] = sub
-                            try:
-                                hrs_int = int(hrs)
-                            except ValueError:
-                                hrs_int = 0
-
-                            
-                            
-                            if sub.lower().endswith('_lab') and hrs_int == 1:
-                                sg.hours[j] = 2
-                            else:
-                                sg.hours[j] = hrs_int
-
-                            j += 1
-                        
-                    sg.nosubject = j
-                    InputData.student_group.append(sg)
-                    student_group_index += 1
+                    self._add_student_group(parts[0], zip(subject_data[::2], subject_data[1::2]))
                     
                 elif mode == "unavailability":
                     
                     parts = line.split()
                     if len(parts) < 2: continue
                         
-                    teacher_name = parts[0]
-                    slot_indices = [int(p) for p in parts[1:]] 
-                    
-                    
-                    self.unavailability_data[teacher_name.lower()] = slot_indices
-                    
-            
-            InputData.nostudentgroup = len(InputData.student_group)
-            InputData.noteacher = len(InputData.teacher)
+                    self.unavailability_data[parts[0].lower()] = [int(p) for p in parts[1:]]
             
         except FileNotFoundError:
             print(f"Error: Input file not found at {file_path}")
 
-    
+    def _take_payload(self, data: Dict[str, Any]):
+        for sg in data["studentgroups"]:
+            self._add_student_group(sg["group"], sg["subjects"].items())
+
+        for t in data["teachers"]:
+            subject = t["subject"]
+            self._add_teacher(t["name"], subject if isinstance(subject, list) else [subject])
+
+        # Lab teachers share one combined "Labs" entry, as in the file format.
+        for ua in combine_lab_availability(data["teacherunavailability"], data["teachers"]):
+            self.unavailability_data[ua["name"].lower()] = [int(s) for s in ua["slots"]]
+
+    def _add_teacher(self, name: str, subjects: List[str]):
+        teacher = Teacher() 
+        teacher.id = len(self.teacher)
+        teacher.name = name
+        teacher.subjects = list(subjects)
+        teacher.subject = teacher.subjects[0] if teacher.subjects else ""
+        self.teacher.append(teacher)
+
+    def _add_student_group(self, name: str, subjects: Iterable[Tuple[str, Any]]):
+        sg = StudentGroup(id=len(self.student_group), name=name)
+        
+        for sub, hrs in subjects:
+            try:
+                hrs_int = max(0, int(hrs))
+            except (TypeError, ValueError):
+                hrs_int = 0
+
+            if sub.lower().endswith('_lab') and hrs_int == 1:
+                hrs_int = 2
+            sg.add_subject(sub, hrs_int)
+            
+        self.student_group.append(sg)
+
     def _merge_unavailability_data(self):
-        for teacher in InputData.teacher:
+        for teacher in self.teacher:
             teacher_name_lower = teacher.name.lower()
             
             if teacher_name_lower in self.unavailability_data:
@@ -158,21 +149,30 @@ class InputData:
     
 
     def _assign_teacher(self):
-        for sg in InputData.student_group:
+        # subject -> min-heap of (assigned, teacher index). A teacher with
+        # several subjects sits in several heaps, so entries can go stale
+        # when another subject assigns them; stale entries are refreshed
+        # when they reach the top.
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        for k, teacher in enumerate(self.teacher):
+            for subject in set(sub.lower() for sub in teacher.subjects):
+                index.setdefault(subject, []).append((teacher.assigned, k))
+        for heap in index.values():
+            heapq.heapify(heap)
+
+        for sg in self.student_group:
             for j in range(sg.nosubject):
-                
-                teacher_id = -1
-                assigned_min = -1
-                subject = sg.subject[j]
-
-                for k, teacher in enumerate(InputData.teacher):
+                heap = index.get(sg.subject[j].lower())
+                if not heap:
+                    continue
 
-                    if teacher.subject.lower() == subject.lower():
+                while True:
+                    assigned, teacher_id = heap[0]
+                    current = self.teacher[teacher_id].assigned
+                    if assigned == current:
+                        break
+                    heapq.heapreplace(heap, (current, teacher_id))
 
-                        if assigned_min == -1 or teacher.assigned < assigned_min:
-                            assigned_min = teacher.assigned
-                            teacher_id = k 
-                
-                if teacher_id != -1:
-                    InputData.teacher[teacher_id].assigned += 1 
-                    sg.teacher_id[j] = teacher_id
\ No newline at end of file
+                self.teacher[teacher_id].assigned += 1 
+                sg.teacher_id[j] = teacher_id
+                heapq.heapreplace(heap, (current + 1, teacher_id))
@@ -0,0 +1,214 @@
+import multiprocessing
+import queue
+import random
+import threading
+import time
+from typing import List, Dict, Any, Optional, Callable
+
+from app.algorithm.breeding_pool import pack_genomes, unpack_genomes
+from app.algorithm.chromosome import Chromosome
+from app.algorithm.scheduler_main import SchedulerMain
+from app.algorithm.solver_context import SolverContext
+
+
+def _run_island(
+    index: int,
+    context: SolverContext,
+    settings: Dict[str, Any],
+    inbox: Any,
+    outbox: Any,
+    stop: Any,
+):
+    random.seed(settings["seed"])
+
+    scheduler = SchedulerMain(context, run=False, **settings["scheduler"])
+    scheduler._initialise_population()
+
+    typecode = scheduler.first_list[0].genome.typecode
+    upstream_done = False
+    while scheduler.generation < scheduler.max_generations and not stop.is_set():
+        # An island's time budget and stall detector only stop that island.
+        if scheduler.check_stop() is not None:
+            break
+        son = scheduler._next_generation()
+
+        if son is not None:
+            stop.set()
+            outbox.put(("solved", index, typecode, pack_genomes([son]), _island_counters(scheduler)))
+            return
+
+        if scheduler.generation % settings["migration_interval"] == 0:
+            best = scheduler.first_list[:settings["migrants"]]
+            stats = scheduler.generation_stats(scheduler.first_list)
+            outbox.put(("migrants", index, typecode, pack_genomes(best), stats))
+
+            # Wait for the neighbour's migrants, giving up if another
+            # island has already found a solution.
+            while not stop.is_set() and not upstream_done:
+                try:
+                    data = inbox.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                # None: the neighbour has stopped and sends no more migrants.
+                if data is None:
+                    upstream_done = True
+                else:
+                    scheduler.accept_migrants(unpack_genomes(context, typecode, data))
+                break
+
+    outbox.put((
+        "done", index, typecode, pack_genomes([scheduler.best] if scheduler.best else []), _island_counters(scheduler)
+    ))
+
+
+def _island_counters(scheduler: SchedulerMain) -> Dict[str, int]:
+    return {"generations": scheduler.generation, "mutation_attempts": scheduler.mutation_attempts}
+
+
+class IslandScheduler:
+    """Runs several independent SchedulerMain populations in separate
+    processes, passing each island's best chromosomes to the next island
+    (ring topology) every migration_interval generations. Every island
+    stops as soon as any of them reaches fitness 1.0.
+
+    on_generation receives the combined statistics of all islands once
+    every running island has reached a migration epoch.
+    """
+
+    def __init__(
+        self,
+        context: SolverContext,
+        islands: int = 4,
+        migration_interval: int = 5,
+        migrants: int = 5,
+        population_size: int = 1000,
+        max_generations: int = 100,
+        fitness_engine: str = "python",
+        on_generation: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        run: bool = True,
+        **scheduler_settings: Any,
+    ):
+        self.context = context
+        self.islands = max(1, islands)
+        self.migration_interval = max(1, migration_interval)
+        self.migrants = max(1, migrants)
+        self.population_size = population_size
+        self.max_generations = max_generations
+        self.fitness_engine = fitness_engine
+        # Extra SchedulerMain arguments (mutation, repair_attempts, ...) for every island
+        self.scheduler_settings = dict(
+            scheduler_settings,
+            population_size=population_size,
+            max_generations=max_generations,
+            fitness_engine=fitness_engine,
+        )
+
+        self.on_generation = on_generation
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        self.stop_reason: Optional[str] = None
+
+        self.final_son: Optional[Chromosome] = None
+        self.best: Optional[Chromosome] = None
+        # Summed over the islands that reported back before the run ended.
+        self.generation = 0
+        self.mutation_attempts = 0
+
+        if run:
+            self.run()
+
+    def run(self) -> Optional[Chromosome]:
+        context = multiprocessing.get_context()
+        outbox = context.Queue()
+        inboxes = [context.Queue() for _ in range(self.islands)]
+        stop = context.Event()
+
+        processes = []
+        for index in range(self.islands):
+            settings = {
+                "seed": random.getrandbits(32),
+                "migration_interval": self.migration_interval,
+                "migrants": self.migrants,
+                "scheduler": self.scheduler_settings,
+            }
+            process = context.Process(
+                target=_run_island,
+                args=(index, self.context, settings, inboxes[index], outbox, stop),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+
+        started = time.perf_counter()
+        finished = 0
+        candidates: List[Chromosome] = []
+        # Island statistics by migration generation, until every running
+        # island has reported that generation.
+        epochs: Dict[int, List[Dict[str, Any]]] = {}
+        try:
+            while finished < self.islands:
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    self.cancelled = True
+                    break
+                try:
+                    kind, index, typecode, data, info = outbox.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in processes):
+                        break
+                    continue
+
+                if kind == "migrants":
+                    inboxes[(index + 1) % self.islands].put(data)
+                    epochs.setdefault(info["generation"], []).append(info)
+                    self._report_epochs(epochs, self.islands - finished, started)
+                    continue
+
+                finished += 1
+                self.generation += info["generations"]
+                self.mutation_attempts += info["mutation_attempts"]
+                inboxes[(index + 1) % self.islands].put(None)
+                # The epochs still pending no longer wait for this island.
+                self._report_epochs(epochs, self.islands - finished, started)
+                chromosomes = unpack_genomes(self.context, typecode, data)
+                candidates.extend(chromosomes)
+                if kind == "solved" and chromosomes:
+                    self.final_son = chromosomes[0]
+        finally:
+            stop.set()
+            for inbox in inboxes:
+                inbox.cancel_join_thread()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        if candidates:
+            self.best = min(candidates, key=lambda c: c.point)
+        if self.final_son is not None:
+            self.stop_reason = "solved"
+        elif self.cancelled:
+            self.stop_reason = "cancelled"
+        else:
+            self.stop_reason = "islands_finished"
+        self.context.final_son = self.final_son
+        return self.final_son
+
+    def _report_epochs(self, epochs: Dict[int, List[Dict[str, Any]]], running: int, started: float):
+        # Reports, oldest first, every epoch that all running islands reached.
+        for generation in sorted(epochs):
+            islands = epochs[generation]
+            if len(islands) < running:
+                break
+            del epochs[generation]
+            if self.on_generation is None or not islands:
+                continue
+            conflicts = [s["best_conflicts"] for s in islands if s["best_conflicts"] is not None]
+            self.on_generation({
+                "generation": generation,
+                "best_fitness": max(s["best_fitness"] for s in islands),
+                "mean_fitness": sum(s["mean_fitness"] for s in islands) / len(islands),
+                "best_conflicts": min(conflicts) if conflicts else None,
+                "elapsed": time.perf_counter() - started,
+                "islands": len(islands),
+            })
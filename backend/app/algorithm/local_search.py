@@ -0,0 +1,231 @@
+import math
+import random
+import threading
+import time
+from array import array
+from typing import List, Dict, Optional, Any, Callable, Tuple
+
+from app.algorithm.chromosome import Chromosome
+from app.algorithm.greedy_initializer import greedy_genome
+from app.algorithm.solver_context import SolverContext
+
+# A move is a list of (pos1, pos2) swaps inside one group; applying the
+# same swaps in reverse order undoes it.
+Move = Tuple[int, List[Tuple[int, int]]]
+
+
+class LocalSearchScheduler:
+    """Single-solution local search over one Chromosome.
+
+    Each step swaps two periods of one group (or moves a whole lab block)
+    and scores it with the chromosome's incremental fitness. "annealing"
+    accepts worse moves with probability exp(-delta / temperature) under a
+    geometric cooling schedule; "tabu" takes the best of tabu_candidates
+    sampled moves whose periods were not moved in the last tabu_tenure
+    steps, unless it beats the best solution so far.
+
+    Exposes the same results as SchedulerMain: final_son, best,
+    stop_reason and cancelled.
+    """
+
+    def __init__(
+        self,
+        context: SolverContext,
+        method: str = "annealing",
+        max_iterations: int = 200000,
+        initial_temperature: float = 2.0,
+        cooling_rate: float = 0.9995,
+        tabu_tenure: int = 20,
+        tabu_candidates: int = 20,
+        stall_iterations: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        warm_start: Optional[array] = None,
+        mutable_groups: Optional[List[int]] = None,
+        on_generation: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        report_interval: int = 1000,
+        run: bool = True,
+    ):
+        if method not in ("annealing", "tabu"):
+            raise ValueError(f"Unknown local search method: {method}")
+
+        self.context = context
+        self.config = context.config
+        self.method = method
+        self.max_iterations = max_iterations
+        # Temperatures are in conflicts (one conflict = 4000 points).
+        self.initial_temperature = initial_temperature
+        self.cooling_rate = cooling_rate
+        self.tabu_tenure = tabu_tenure
+        self.tabu_candidates = tabu_candidates
+        self.stall_iterations = stall_iterations
+        self.time_budget = time_budget
+        self.warm_start = warm_start
+        self.active_groups: List[int] = (
+            list(mutable_groups) if mutable_groups is not None else list(range(self.config.nostudentgroup))
+        )
+        self.on_generation = on_generation
+        self.cancel_event = cancel_event
+        self.report_interval = max(1, report_interval)
+
+        self.iteration = 0
+        self.temperature = initial_temperature
+        self.tabu: Dict[Tuple[int, int], int] = {}
+        self.current: Optional[Chromosome] = None
+        self.best: Optional[Chromosome] = None
+        self.best_iteration = 0
+        self.final_son: Optional[Chromosome] = None
+        self.stop_reason: Optional[str] = None
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+
+        if run:
+            self.run()
+
+    def run(self) -> Optional[Chromosome]:
+        self.started_at = time.perf_counter()
+        # Start from the warm start if given, otherwise a greedy construction.
+        if self.warm_start is not None:
+            genome = self.warm_start[:]
+        else:
+            genome = greedy_genome(self.context)
+        self.current = Chromosome(self.context, genome=genome)
+        self.best = self.current.deep_clone()
+        self.best_iteration = 0
+        self.temperature = self.initial_temperature
+        self.tabu = {}
+
+        self.stop_reason = "max_iterations"
+        for self.iteration in range(1, self.max_iterations + 1):
+            if self.best.fitness == 1.0:
+                self.stop_reason = "solved"
+                break
+            reason = self._check_stop()
+            if reason is not None:
+                self.stop_reason = reason
+                self.cancelled = reason == "cancelled"
+                break
+
+            if self.method == "annealing":
+                self._anneal_step()
+            else:
+                self._tabu_step()
+
+            if self.current.point < self.best.point:
+                self.best = self.current.deep_clone()
+                self.best_iteration = self.iteration
+            if self.iteration % self.report_interval == 0:
+                self._report()
+
+        if self.best.fitness == 1.0:
+            self.stop_reason = "solved"
+            self.final_son = self.best
+            self.context.final_son = self.best
+        self._report()
+        return self.final_son
+
+    def _check_stop(self) -> Optional[str]:
+        if self.stall_iterations is not None and self.iteration - self.best_iteration > self.stall_iterations:
+            return "stalled"
+        # The clock and the cancel flag are only polled every 256 steps.
+        if self.iteration & 255:
+            return None
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return "cancelled"
+        if self.time_budget is not None and time.perf_counter() - self.started_at >= self.time_budget:
+            return "time_budget"
+        return None
+
+    def _anneal_step(self):
+        c = self.current
+        move = self._random_move(c)
+        if move is None:
+            return
+
+        before = c.point
+        self._apply(c, move)
+        delta = (c.point - before) / 4000
+        if delta > 0 and random.random() >= math.exp(-delta / max(self.temperature, 1e-9)):
+            self._undo(c, move)
+        self.temperature *= self.cooling_rate
+
+    def _tabu_step(self):
+        c = self.current
+        best_move = None
+        best_point = None
+        for _ in range(self.tabu_candidates):
+            move = self._random_move(c)
+            if move is None:
+                continue
+            self._apply(c, move)
+            point = c.point
+            self._undo(c, move)
+
+            # Aspiration: a tabu move is allowed if it beats the best so far.
+            if self._is_tabu(c, move) and point >= self.best.point:
+                continue
+            if best_point is None or point < best_point:
+                best_move, best_point = move, point
+
+        if best_move is None:
+            return
+        for key in self._move_keys(c, best_move):
+            self.tabu[key] = self.iteration + self.tabu_tenure
+        self._apply(c, best_move)
+
+    def _move_keys(self, c: Chromosome, move: Move) -> List[Tuple[int, int]]:
+        # A move is identified by the (group, slot index) pairs it displaces.
+        geneno, swaps = move
+        start = geneno * c.total_slots
+        return [(geneno, c.genome[start + p1]) for p1, _ in swaps]
+
+    def _is_tabu(self, c: Chromosome, move: Move) -> bool:
+        return any(self.tabu.get(key, 0) > self.iteration for key in self._move_keys(c, move))
+
+    def _random_move(self, c: Chromosome) -> Optional[Move]:
+        # Prefer a period that is in conflict: sample a few groups and take
+        # the first one that has any.
+        geneno = random.choice(self.active_groups)
+        positions: List[int] = []
+        for _ in range(5):
+            positions = c.conflict_positions(geneno)
+            if positions:
+                break
+            geneno = random.choice(self.active_groups)
+
+        start = geneno * c.total_slots
+        pos = random.choice(positions) if positions else random.randrange(c.total_slots)
+
+        if c.is_lab_slot(c.genome[start + pos]):
+            first, last = c.lab_block(geneno, pos)
+            targets = c.lab_block_targets(geneno, first, last)
+            if not targets:
+                return None
+            target = random.choice(targets)
+            return geneno, [(first + k, target + k) for k in range(last - first + 1)]
+
+        target = random.randrange(c.total_slots)
+        if target == pos or c.is_lab_slot(c.genome[start + target]):
+            return None
+        return geneno, [(pos, target)]
+
+    def _apply(self, c: Chromosome, move: Move):
+        geneno, swaps = move
+        for p1, p2 in swaps:
+            c.swap_slots(geneno, p1, p2)
+
+    def _undo(self, c: Chromosome, move: Move):
+        geneno, swaps = move
+        for p1, p2 in reversed(swaps):
+            c.swap_slots(geneno, p1, p2)
+
+    def _report(self):
+        if self.on_generation is None:
+            return
+        self.on_generation({
+            "generation": self.iteration,
+            "best_fitness": self.best.fitness,
+            "mean_fitness": self.current.fitness,
+            "best_conflicts": self.best.point // 4000,
+            "elapsed": time.perf_counter() - self.started_at,
+        })
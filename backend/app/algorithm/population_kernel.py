@@ -0,0 +1,100 @@
+from array import array
+from typing import List, Any
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only required for the vectorized engine
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+class PopulationKernel:
+    """Batched fitness evaluation of the initial population.
+
+    The population is held as one integer array of shape
+    (population, groups, slots) containing slot table indices, and the
+    penalty uses the same rules as Chromosome.get_fitness. Later
+    generations are not re-scored here: crossover and mutation edit one
+    row at a time and keep each child's points up to date incrementally.
+    """
+
+    def __init__(self, context: Any):
+        if np is None:
+            raise ImportError("The 'numpy' fitness engine requires numpy to be installed")
+
+        config = context.config
+        self.nostgrp = config.nostudentgroup
+        self.total_slots = config.daysperweek * config.hoursperday
+        self.noteacher = len(config.teacher)
+
+        # Same tables as the python engine: slot index -> teacher id (-1 for
+        # none), and the unavailability bitmasks unpacked per week slot.
+        self.slot_teacher = np.asarray(context.slot_teacher, dtype=np.int64)
+        self.unavailable = np.array(
+            [[mask >> s & 1 for s in range(self.total_slots)] for mask in context.unavailable_mask]
+            or [[0] * self.total_slots],
+            dtype=bool,
+        )
+
+        worst_conflict_penalty = (self.nostgrp - 1) * self.total_slots * 250
+        worst_unavail_penalty = self.noteacher * self.total_slots * 700
+        self.max_conflicts = max(1.0, worst_conflict_penalty + worst_unavail_penalty)
+
+    def points(self, genomes: 'np.ndarray') -> 'np.ndarray':
+        population = genomes.shape[0]
+        teachers = self.slot_teacher[genomes]
+        valid = teachers >= 0
+
+        # Gather the unavailability flag of every (teacher, week slot) pair.
+        flat_index = np.where(valid, teachers, 0) * self.total_slots + np.arange(self.total_slots)
+        unavailable = self.unavailable.reshape(-1)[flat_index] & valid
+        unavailable_count = unavailable.reshape(population, -1).sum(axis=1)
+
+        # Sort the teachers of each week slot across groups; every teacher
+        # equal to its predecessor is one more group sharing that teacher.
+        by_slot = np.sort(teachers.transpose(0, 2, 1), axis=2)
+        repeated = (by_slot[:, :, 1:] == by_slot[:, :, :-1]) & (by_slot[:, :, 1:] >= 0)
+        clash_count = repeated.reshape(population, -1).sum(axis=1)
+
+        return (unavailable_count + clash_count) * 4000
+
+    def fitness(self, genomes: 'np.ndarray') -> 'np.ndarray':
+        return np.clip(1.0 - self.points(genomes) / self.max_conflicts, 0.0, None)
+
+    def to_array(self, chromosomes: List[Any]) -> 'np.ndarray':
+        # Chromosome genomes are flat array('H'/'I') buffers, so this is a
+        # plain buffer concatenation.
+        dtype = np.uint16 if chromosomes[0].genome.typecode == 'H' else np.uint32
+        return np.frombuffer(
+            b"".join(c.genome.tobytes() for c in chromosomes), dtype=dtype
+        ).reshape(len(chromosomes), self.nostgrp, self.total_slots)
+
+    def occupancy(self, genomes: 'np.ndarray') -> 'np.ndarray':
+        # Chromosome.occupancy for every genome: counts[c, i * noteacher + t]
+        # is the number of groups with teacher t in week slot i.
+        population = genomes.shape[0]
+        cells = self.total_slots * self.noteacher
+        teachers = self.slot_teacher[genomes]
+        valid = teachers >= 0
+        index = (
+            np.arange(population)[:, None, None] * cells
+            + np.arange(self.total_slots) * self.noteacher
+            + teachers
+        )
+        counts = np.bincount(index[valid], minlength=population * cells)
+        return counts.astype(np.uint16).reshape(population, cells)
+
+    def evaluate_chromosomes(self, chromosomes: List[Any]):
+        # Sets both the points and the occupancy counts, so the chromosomes
+        # can be bred without a full get_fitness rebuild.
+        if not chromosomes:
+            return
+
+        genomes = self.to_array(chromosomes)
+        points = self.points(genomes).tolist()
+        occupancy = self.occupancy(genomes)
+        for c, point, counts in zip(chromosomes, points, occupancy):
+            cells = array('H')
+            cells.frombytes(counts.tobytes())
+            c.set_point(point, cells)
@@ -0,0 +1,58 @@
+from typing import Any, Dict, List
+
+
+class SolverProfile:
+    """Timers and counters for one SchedulerMain run.
+
+    SchedulerMain only touches this when profiling is enabled (its profile
+    is None otherwise), so a disabled profile costs one attribute check per
+    instrumented call.
+    """
+
+    # Counters that are also reported per generation
+    PER_GENERATION = ("fitness_evaluations", "children", "mutation_attempts")
+
+    def __init__(self):
+        self.timers: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.generations: List[Dict[str, Any]] = []
+        self._generation_start: Dict[str, int] = {}
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [calls, seconds]
+        else:
+            timer[0] += calls
+            timer[1] += seconds
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def end_generation(self, generation: int):
+        entry = {"generation": generation}
+        for name in self.PER_GENERATION:
+            total = self.counters.get(name, 0)
+            entry[name] = total - self._generation_start.get(name, 0)
+            self._generation_start[name] = total
+        self.generations.append(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        children = self.counters.get("children", 0)
+        return {
+            "timers": {
+                name: {"calls": int(calls), "seconds": seconds, "mean_us": seconds / calls * 1e6 if calls else 0.0}
+                for name, (calls, seconds) in self.timers.items()
+            },
+            "counters": dict(self.counters),
+            "mutation_attempts_per_child": self.counters.get("mutation_attempts", 0) / children if children else 0.0,
+            "generations": list(self.generations),
+        }
+
+    def summary(self) -> str:
+        parts = [
+            f"{name}={seconds:.3f}s/{int(calls)}"
+            for name, (calls, seconds) in sorted(self.timers.items(), key=lambda item: -item[1][1])
+        ]
+        parts += [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        return " ".join(parts)
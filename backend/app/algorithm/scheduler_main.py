@@ -1,145 +1,532 @@
 import random
-from typing import List, Optional, Any
-import copy 
+import threading
+import time
+from array import array
+from typing import List, Dict, Optional, Any, Callable
 
 from app.algorithm.chromosome import Chromosome
 from app.algorithm.gene import Gene
-from app.algorithm.time_table import TimeTable
 from app.algorithm.input_data import InputData 
+from app.algorithm.solver_context import SolverContext
+from app.algorithm.population_kernel import PopulationKernel
+from app.algorithm.breeding_pool import BreedingPool
+from app.algorithm.warm_start import perturb_genome
+from app.algorithm.greedy_initializer import greedy_genome
+from app.algorithm.profiling import SolverProfile
+from app.algorithm.fitness_cache import FitnessCache
 
 class SchedulerMain:
-
-    final_son: Optional['Chromosome'] = None
     
-    def __init__(self, config_data: InputData):
+    def __init__(
+        self,
+        context: SolverContext,
+        fitness_engine: str = "python",
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+        population_size: int = 1000,
+        max_generations: int = 100,
+        mutation: str = "repair",
+        repair_attempts: int = 100,
+        on_generation: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        time_budget: Optional[float] = None,
+        stall_generations: Optional[int] = None,
+        warm_start: Optional[array] = None,
+        warm_start_fraction: float = 0.2,
+        warm_start_swaps: int = 5,
+        mutable_groups: Optional[List[int]] = None,
+        greedy_fraction: float = 0.0,
+        selection: str = "roulette",
+        tournament_size: int = 3,
+        profile: bool = False,
+        fitness_cache_size: int = 0,
+        run: bool = True,
+    ):
                 
-        self.config = config_data
+        self.context = context
+        self.config = context.config
+        self.final_son: Optional['Chromosome'] = None
+        self.fitness_engine = fitness_engine
+        # "repair" moves only conflicting periods (bounded by
+        # repair_attempts); "regenerate" rebuilds a random group's gene.
+        if mutation not in ("repair", "regenerate"):
+            raise ValueError(f"Unknown mutation operator: {mutation}")
+        self.mutation = mutation
+        self.repair_attempts = repair_attempts
+        # workers > 1 breeds the non-elite children in a process pool,
+        # chunk_size children per task (default: split evenly per worker).
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        # on_generation receives per-generation statistics; setting
+        # cancel_event stops the run at the next child.
+        self.on_generation = on_generation
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        # The run also ends after time_budget seconds, or once the best
+        # penalty has not improved for stall_generations generations; best
+        # is then the fittest chromosome seen so far.
+        self.time_budget = time_budget
+        self.stall_generations = stall_generations
+        self.best: Optional['Chromosome'] = None
+        self.best_generation: int = 0
+        self.stop_reason: Optional[str] = None
+        # warm_start is a genome (e.g. a previously stored timetable); that
+        # fraction of the first population is seeded with it, the first copy
+        # exact and the rest with up to warm_start_swaps random swaps.
+        self.warm_start = warm_start
+        self.warm_start_fraction = warm_start_fraction
+        self.warm_start_swaps = warm_start_swaps
+        # Incremental re-solve: only these groups are crossed over and
+        # mutated, every other group keeps its warm_start gene.
+        self.mutable_groups = mutable_groups
+        self.active_groups: List[int] = (
+            list(mutable_groups) if mutable_groups is not None else list(range(self.config.nostudentgroup))
+        )
+        if mutable_groups is not None and warm_start is None:
+            raise ValueError("mutable_groups requires a warm_start genome")
+        # Share of the first population built by the greedy constructive
+        # initializer instead of random Genes.
+        self.greedy_fraction = greedy_fraction
+        # Parent selection among the elite: "roulette" (fitness-proportional)
+        # or "tournament" (best of tournament_size random picks)
+        if selection not in ("roulette", "tournament"):
+            raise ValueError(f"Unknown selection operator: {selection}")
+        self.selection = selection
+        self.tournament_size = max(1, tournament_size)
+        self._alias_source: Optional[List['Chromosome']] = None
+        self._alias_table: Any = None
+        # Per-phase timers and counters, only collected when profile=True.
+        # fitness_evaluations counts scored candidates: the population,
+        # crossover children not found in the fitness cache (or skipped as
+        # identical to a parent) and every mutation attempt.
+        self.profile: Optional[SolverProfile] = SolverProfile() if profile else None
+        self.mutation_attempts: int = 0
+        # Optional LRU of crossover children's penalty points by genome hash
+        # (0 = off); stats() reports its hit rate.
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache: Optional[FitnessCache] = (
+            FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        )
             
         self.first_list: List['Chromosome'] = []
         self.new_list: List['Chromosome'] = []
         self.first_list_fitness: float = 0.0
         self.new_list_fitness: float = 0.0
-        self.population_size: int = 1000
-        self.max_generations: int = 100
+        self.population_size: int = population_size
+        self.max_generations: int = max_generations
+        self.generation: int = 0
+        self.started_at: float = time.perf_counter()
+
+        # "numpy" scores the initial population with one batched kernel
+        # call; children are always scored incrementally as they are bred.
+        self.kernel: Optional[PopulationKernel] = None
+        if self.fitness_engine == "numpy":
+            self.kernel = PopulationKernel(self.context)
+        elif self.fitness_engine != "python":
+            raise ValueError(f"Unknown fitness engine: {self.fitness_engine}")
 
-        TimeTable(self.config) 
+        if not run:
+            return
                 
         self._initialise_population()
         
         self._create_new_generations()
     
     def _initialise_population(self):    
+        prof = self.profile
+        self.started_at = time.perf_counter()
+        self.best = None
+        self.best_generation = 0
+        self.stop_reason = None
         self.first_list = []
         self.first_list_fitness = 0.0
         
         for i in range(self.population_size):
-            c = Chromosome(self.config) 
+            # A tight time budget may leave a smaller first population.
+            if i > 0 and self.out_of_time():
+                break
+            c = Chromosome(self.context, evaluate=self.kernel is None, genome=self._seed_genome(i)) 
             self.first_list.append(c)
-            self.first_list_fitness += c.fitness
+
+        if prof is not None:
+            t0 = time.perf_counter()
+            prof.add_time("initialise", t0 - self.started_at)
+        self.evaluate_initial_population(self.first_list)
+        self.first_list_fitness = sum(c.fitness for c in self.first_list)
+        if prof is not None:
+            prof.add_time("evaluate", time.perf_counter() - t0)
+            prof.count("fitness_evaluations", len(self.first_list))
     
         self.first_list.sort(reverse=True)    
         self._print_generation(self.first_list)
 
+    def _seed_genome(self, i: int) -> Optional[array]:
+        # Population order: warm-start copies, greedy constructions, then
+        # random genes (for the mutable groups only, when re-solving).
+        warm_count = 0
+        if self.warm_start is not None:
+            warm_count = max(1, int(self.population_size * self.warm_start_fraction))
+            if i == 0:
+                return self.warm_start[:]
+            if i < warm_count:
+                return perturb_genome(
+                    self.context, self.warm_start, random.randint(1, self.warm_start_swaps), self.mutable_groups
+                )
+
+        if i < warm_count + int(self.population_size * self.greedy_fraction):
+            base = self.warm_start if self.mutable_groups is not None else None
+            return greedy_genome(self.context, base, self.mutable_groups)
+
+        if self.mutable_groups is None:
+            return None
+
+        # Fixed groups from warm_start, fresh random genes for the rest
+        genome = self.warm_start[:]
+        total_slots = self.config.daysperweek * self.config.hoursperday
+        for g in self.mutable_groups:
+            genome[g * total_slots:(g + 1) * total_slots] = Gene(g, self.context).slotno
+        return genome
+
     def _create_new_generations(self):        
-        nogenerations = 0
-        while nogenerations < self.max_generations:	
+        self.generation = 0
+        # A warm-started population can already contain a valid timetable.
+        if self.first_list and self.first_list[0].fitness == 1.0:
+            self.final_son = self.best = self.first_list[0]
+            self.context.final_son = self.final_son
+            self.stop_reason = "solved"
+            return
+
+        pool = BreedingPool(self) if self.workers > 1 else None
+        try:
+            while self.generation < self.max_generations:	
+                self.stop_reason = self.check_stop()
+                if self.stop_reason is not None:
+                    self.cancelled = self.stop_reason == "cancelled"
+                    break
+                son = self._next_generation(pool)
+                if son is not None:
+                    self.final_son = son
+                    self.context.final_son = son
+                    self.best = son
+                    self.stop_reason = "solved"
+                    break
+            else:
+                self.stop_reason = "max_generations"
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _next_generation(self, pool: Optional[BreedingPool] = None) -> Optional['Chromosome']:
+        # Builds one generation into first_list; returns the child that
+        # reached fitness 1.0, if any.
+        prof = self.profile
+        self.generation += 1
+        self.new_list = []
+        self.new_list_fitness = 0.0
+        if prof is not None:
+            t0 = time.perf_counter()
+        elite_size = min(self.population_size // 10, len(self.first_list))
+        for i in range(elite_size):
+            elite_chromosome = self.first_list[i].deep_clone()
+            self.new_list.append(elite_chromosome)
+            self.new_list_fitness += elite_chromosome.fitness
+
+        if prof is not None:
+            t1 = time.perf_counter()
+            prof.add_time("clone", t1 - t0, elite_size)
+        count = self.population_size - len(self.new_list)
+        if pool is not None:
+            children = pool.breed(self.first_list[:elite_size], count)
+        else:
+            children = self.breed(count)
+        if prof is not None:
+            t2 = time.perf_counter()
+            prof.add_time("breed", t2 - t1)
+
+        for son in children:
+            if son.fitness == 1.0:
+                son.print_chromosome()
+                if prof is not None:
+                    prof.end_generation(self.generation)
+                return son
+
+            self.new_list.append(son)
+            self.new_list_fitness += son.fitness
             
-            self.new_list = []
-            self.new_list_fitness = 0.0
-            i = 0
-            elite_size = min(self.population_size // 10, len(self.first_list))
-            for i in range(elite_size):
-                elite_chromosome = self.first_list[i].deep_clone()
-                self.new_list.append(elite_chromosome)
-                self.new_list_fitness += elite_chromosome.fitness
-            while i < self.population_size:
-                
-                father = self._select_parent_roulette()
-                mother = self._select_parent_roulette()
-                son = None
-                if random.random() < self.config.crossover_rate:
-                    son = self._crossover(father, mother)	
-                else:
-                    son = father 
-                
-                
-                self._custom_mutation(son)
-                
-                if son.fitness == 1.0:
-                    
-                    son.print_chromosome()
-                    break 
-                
-                self.new_list.append(son)
-                self.new_list_fitness += son.get_fitness() 
-                i += 1
-            if i < self.population_size:
-                son.print_time_table()
-                SchedulerMain.final_son = son
-                break
-                
-            self.first_list = self.new_list
+        self.first_list = self.new_list
+        
+        self.first_list.sort(reverse=True) 
+        
+        if prof is not None:
+            prof.add_time("sort", time.perf_counter() - t2)
+            prof.end_generation(self.generation)
+        self._print_generation(self.first_list)
+        return None
+
+    def breed(self, count: int) -> List['Chromosome']:
+        # Produces up to count children from first_list, stopping early at
+        # the first child with fitness 1.0.
+        prof = self.profile
+        clock = time.perf_counter
+        children = []
+        while len(children) < count and not self.stop_requested() and not self.out_of_time():
+            if prof is not None:
+                t0 = clock()
+            father = self._select_parent()
+            mother = self._select_parent()
+            if prof is not None:
+                t1 = clock()
+                prof.add_time("selection", t1 - t0, 2)
+            son = None
+            if random.random() < self.config.crossover_rate:
+                son = self._crossover(father, mother)	
+                if prof is not None:
+                    prof.add_time("crossover", clock() - t1)
+            else:
+                son = father.deep_clone()
+                if prof is not None:
+                    prof.add_time("clone", clock() - t1)
             
-            self.first_list.sort(reverse=True) 
+            if prof is not None:
+                t2 = clock()
+            attempts = self._mutate(son)
+            self.mutation_attempts += attempts
+            if prof is not None:
+                prof.add_time("mutation", clock() - t2)
+                prof.count("mutation_attempts", attempts)
+                prof.count("fitness_evaluations", attempts)
+                prof.count("children")
+            children.append(son)
             
-            self._print_generation(self.first_list)
-            nogenerations += 1
+            if son.fitness == 1.0:
+                break
+        return children
+
+    def stop_requested(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def out_of_time(self) -> bool:
+        return self.time_budget is not None and time.perf_counter() - self.started_at >= self.time_budget
+
+    def check_stop(self) -> Optional[str]:
+        # Why the run should end after the current generation, if it should.
+        if self.stop_requested():
+            return "cancelled"
+        if self.out_of_time():
+            return "time_budget"
+        if self.stall_generations is not None and self.generation - self.best_generation >= self.stall_generations:
+            return "stalled"
+        return None
+
+    def breeding_settings(self) -> Dict[str, Any]:
+        # Constructor arguments a worker process needs to breed like this scheduler
+        return {
+            "population_size": self.population_size,
+            "mutation": self.mutation,
+            "repair_attempts": self.repair_attempts,
+            "mutable_groups": self.mutable_groups,
+            "selection": self.selection,
+            "tournament_size": self.tournament_size,
+            "warm_start": self.warm_start,
+            "fitness_cache_size": self.fitness_cache_size,
+            "profile": self.profile is not None,
+        }
+
+    def accept_migrants(self, migrants: List['Chromosome']):
+        # Migrants replace the worst chromosomes of the current population.
+        if not migrants:
+            return
+
+        keep = max(0, len(self.first_list) - len(migrants))
+        self.first_list = self.first_list[:keep] + list(migrants)
+        self.first_list.sort(reverse=True)
+        self.first_list_fitness = sum(c.fitness for c in self.first_list)
+
+    def evaluate_initial_population(self, chromosomes: List['Chromosome']):
+        if self.kernel is not None:
+            self.kernel.evaluate_chromosomes(chromosomes)
+            return
+
+        for c in chromosomes:
+            if c.occupancy is None:
+                c.get_fitness()
+
+    def _select_parent(self) -> 'Chromosome':
+        # Parents are returned uncloned; breed clones only the child it keeps.
+        if self.selection == "tournament":
+            return self._select_parent_tournament()
+        return self._select_parent_roulette()
+
+    def _select_parent_tournament(self) -> 'Chromosome':
+        # Drawn from the elite like the roulette (worker processes only
+        # receive the elite). first_list is sorted best-first, so the winner
+        # of a tournament is simply the smallest sampled index.
+        n = min(len(self.first_list), max(1, self.population_size // 10))
+        return self.first_list[min(random.randrange(n) for _ in range(self.tournament_size))]
 
     def _select_parent_roulette(self) -> 'Chromosome':
-        elite_size = self.population_size // 10
-        
-        elite_list = self.first_list[:elite_size]
-        elite_fitness_sum = sum(c.fitness for c in elite_list)
-        
-        if elite_fitness_sum == 0:
-             
-             return random.choice(elite_list).deep_clone()
+        # Fitness-proportional choice among the elite, O(1) per call via an
+        # alias table that is rebuilt only when first_list changes.
+        if self._alias_source is not self.first_list:
+            self._build_alias_table()
 
-        random_float = random.uniform(0, elite_fitness_sum)
-        current_sum = 0.0
+        elite_list, prob, alias = self._alias_table
+        i = random.randrange(len(elite_list))
+        if random.random() >= prob[i]:
+            i = alias[i]
+        return elite_list[i]
 
-        for chromosome in elite_list:
-            current_sum += chromosome.fitness
-            if current_sum >= random_float:
-                return chromosome.deep_clone() 
-                
-        return elite_list[-1].deep_clone()
-		
+    def _build_alias_table(self):
+        # Vose's alias method; an all-zero elite is sampled uniformly.
+        elite_list = self.first_list[:max(1, self.population_size // 10)]
+        n = len(elite_list)
+        total = sum(c.fitness for c in elite_list)
+        if total == 0:
+            scaled = [1.0] * n
+        else:
+            scaled = [c.fitness * n / total for c in elite_list]
+
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        self._alias_source = self.first_list
+        self._alias_table = (elite_list, prob, alias)
 		
-    def _custom_mutation(self, c: 'Chromosome'):
-        old_fitness = c.get_fitness()
-        geneno = random.randrange(self.config.nostudentgroup)
+    def _mutate(self, c: 'Chromosome') -> int:
+        # Returns the number of mutation attempts made.
+        if self.mutation == "regenerate":
+            return self._custom_mutation(c)
+        else:
+            return self._repair_mutation(c)
+
+    def _repair_mutation(self, c: 'Chromosome') -> int:
+        # Moves only periods that currently clash or sit in an unavailable
+        # slot, within their own group's week, keeping every move that does
+        # not raise the penalty.
+        groups = self.active_groups[:]
+        random.shuffle(groups)
+        attempts = 0
+        for geneno in groups:
+            if attempts >= self.repair_attempts:
+                break
+
+            positions = c.conflict_positions(geneno)
+            while positions and attempts < self.repair_attempts:
+                attempts += 1
+                pos = random.choice(positions)
+                if c.is_lab_slot(c.genome[geneno * c.total_slots + pos]):
+                    moved = self._move_lab_block(c, geneno, pos)
+                else:
+                    moved = self._move_period(c, geneno, pos)
+                if moved:
+                    positions = c.conflict_positions(geneno)
+        return attempts
+
+    def _move_period(self, c: 'Chromosome', geneno: int, pos: int) -> bool:
+        target = random.randrange(c.total_slots)
+        if target == pos or c.is_lab_slot(c.genome[geneno * c.total_slots + target]):
+            return False
+
+        before = c.point
+        c.swap_slots(geneno, pos, target)
+        if c.point > before:
+            c.swap_slots(geneno, pos, target)
+            return False
+        return True
+
+    def _move_lab_block(self, c: 'Chromosome', geneno: int, pos: int) -> bool:
+        first, last = c.lab_block(geneno, pos)
+        targets = c.lab_block_targets(geneno, first, last)
+        if not targets:
+            return False
+
+        m = last - first + 1
+        target = random.choice(targets)
+        before = c.point
+        for k in range(m):
+            c.swap_slots(geneno, first + k, target + k)
+        if c.point > before:
+            for k in range(m):
+                c.swap_slots(geneno, first + k, target + k)
+            return False
+        return True
+
+    def _custom_mutation(self, c: 'Chromosome') -> int:
+        old_point = c.point
+        geneno = random.choice(self.active_groups)
         i = 0
         while True:
-            c.gene[geneno] = Gene(geneno, self.config)
-            new_fitness = c.get_fitness()
+            c.replace_gene(geneno, Gene(geneno, self.context).slotno)
             
-            if new_fitness >= old_fitness:
+            if c.point <= old_point:
                 break 
             
             i += 1
             if i >= 500000: 
-                break	
+                break
+        return i + 1	
 		
     def _crossover(self, father: 'Chromosome', mother: 'Chromosome') -> 'Chromosome':
-        random_index = random.randrange(self.config.nostudentgroup)
-        
-        
-        temp = father.gene[random_index].deep_clone()
-        father.gene[random_index] = mother.gene[random_index].deep_clone()
-        mother.gene[random_index] = temp
+        # Swapping one group's gene gives two children; both are scored by
+        # editing the (shared) parents in place and reverting, and only the
+        # fitter child is cloned.
+        random_index = random.choice(self.active_groups)
+        father_row = father.row(random_index)
+        mother_row = mother.row(random_index)
 
-        
-        father.get_fitness()
-        mother.get_fitness()
-        
-        
-        if father.fitness > mother.fitness:
-            return father
+        if father_row == mother_row:
+            # Identical genes: the children are the parents.
+            return (father if father.point < mother.point else mother).deep_clone()
+
+        father_child_point = self._child_point(father, random_index, father_row, mother_row)
+        mother_child_point = self._child_point(mother, random_index, mother_row, father_row)
+
+        if father_child_point < mother_child_point:
+            son = father.deep_clone()
+            son.replace_gene(random_index, mother_row)
         else:
-            return mother
+            son = mother.deep_clone()
+            son.replace_gene(random_index, father_row)
+        return son
+
+    def _child_point(self, parent: 'Chromosome', group_index: int, own_row: array, row: array) -> int:
+        # Penalty points of parent with row as its gene group_index.
+        cache = self.fitness_cache
+        if cache is not None:
+            key = parent.child_key(group_index, row)
+            point = cache.get(key)
+            if point is not None:
+                if self.profile is not None:
+                    self.profile.count("fitness_cache_hits")
+                return point
+
+        if self.profile is not None:
+            self.profile.count("fitness_evaluations")
+        parent.replace_gene(group_index, row)
+        point = parent.point
+        parent.replace_gene(group_index, own_row)
+        if cache is not None:
+            cache.put(key, point)
+        return point
 	
     def _print_generation(self, list: List['Chromosome']):
+        # Compared on points: fitness is clamped to 0 once the penalty
+        # exceeds max_conflicts, which would hide any progress.
+        if list and (self.best is None or list[0].point < self.best.point):
+            self.best = list[0]
+            self.best_generation = self.generation
+
         for i in range(min(4, len(list))):
     
             list[i].print_chromosome()
@@ -147,6 +534,20 @@ class SchedulerMain:
         
         index_10_percent = self.population_size // 10
         index_20_percent = self.population_size // 5
+
+        if self.on_generation is not None:
+            self.on_generation(self.generation_stats(list))
+
+    def generation_stats(self, list: List['Chromosome']) -> Dict[str, Any]:
+        # Every conflict (teacher clash or unavailable slot) costs 4000 points.
+        best = list[0] if list else None
+        return {
+            "generation": self.generation,
+            "best_fitness": best.fitness if best else 0.0,
+            "mean_fitness": sum(c.fitness for c in list) / len(list) if list else 0.0,
+            "best_conflicts": best.point // 4000 if best else None,
+            "elapsed": time.perf_counter() - self.started_at,
+        }
     
     def select_parent_best(self, list: List['Chromosome']) -> 'Chromosome':
         random_int = random.randrange(min(100, len(list)))
@@ -154,26 +555,25 @@ class SchedulerMain:
 
     def mutation_simple(self, c: 'Chromosome'):
         total_slots = self.config.daysperweek * self.config.hoursperday
-        geneno = random.randrange(self.config.nostudentgroup)
-        slot_list = c.gene[geneno].slotno
+        geneno = random.choice(self.active_groups)
+        slot_list = c.row(geneno)
     
         temp = slot_list[0]
         slot_list[:-1] = slot_list[1:]
         slot_list[-1] = temp
-        c.get_fitness() 
+        c.replace_gene(geneno, slot_list)
     
     def swap_mutation(self, c: 'Chromosome'):
         total_slots = self.config.daysperweek * self.config.hoursperday
-        geneno = random.randrange(self.config.nostudentgroup)
-        slot_list = c.gene[geneno].slotno
+        geneno = random.choice(self.active_groups)
+        slot_list = c.row(geneno)
         
         slotno1 = random.randrange(total_slots)
         slotno2 = random.randrange(total_slots)
         
         
         slot_list[slotno1], slot_list[slotno2] = slot_list[slotno2], slot_list[slotno1]
-        c.get_fitness() 
+        c.replace_gene(geneno, slot_list)
 
 if __name__ == "__main__":
-    config_data = InputData("/tmp/input.txt") 
-    SchedulerMain(config_data)
\ No newline at end of file
+    SchedulerMain(SolverContext(InputData("/tmp/input.txt")))
\ No newline at end of file
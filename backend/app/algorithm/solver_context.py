@@ -0,0 +1,52 @@
+from array import array
+from typing import List, Optional, Any
+
+from app.algorithm.input_data import InputData
+from app.algorithm.time_table import TimeTable
+
+
+class SolverContext:
+    """Everything a single timetable solve owns: the parsed input, the slot
+    table built from it and the resulting chromosome.
+
+    Gene, Chromosome and SchedulerMain read their data from here instead of
+    class-level attributes, so several solves can run in one process.
+    """
+
+    def __init__(self, config: InputData):
+        self.config = config
+        self.timetable = TimeTable(config)
+        self.final_son: Optional[Any] = None
+        # Hash of the canonical solver input, set by load_context
+        self.input_key: Optional[str] = None
+
+        # unavailable_mask[t] has bit pos set when teacher t is unavailable
+        # at week position pos; Python ints grow with the week.
+        total_slots = config.daysperweek * config.hoursperday
+        self.unavailable_mask: List[int] = []
+        for teacher in config.teacher:
+            mask = 0
+            for pos in teacher.unavailable_slots:
+                if 0 <= pos < total_slots:
+                    mask |= 1 << pos
+            self.unavailable_mask.append(mask)
+
+        # slot_teacher[slot index] is the slot's teacher id, or -1 for free
+        # periods and unassigned subjects.
+        noteacher = len(config.teacher)
+        self.slot_teacher = array('i', [
+            s.teacher_id if s is not None and s.teacher_id is not None and 0 <= s.teacher_id < noteacher else -1
+            for s in self.timetable.slot
+        ])
+
+    @property
+    def slots(self) -> List[Any]:
+        return self.timetable.slot
+
+    @property
+    def groups(self) -> List[Any]:
+        return self.config.student_group
+
+    @property
+    def teachers(self) -> List[Any]:
+        return self.config.teacher
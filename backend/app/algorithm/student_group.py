@@ -1,39 +1,42 @@
-from dataclasses import dataclass, field
-from typing import List, Optional, Any
+import sys
+from array import array
+from typing import List, Optional
 
-DEFAULT_CAPACITY = 10 
 
-@dataclass
 class StudentGroup:
-    id: Optional[int] = None
-    name: Optional[str] = None
-    nosubject: int = 0
+    """A group's subjects with their weekly hours and assigned teacher.
 
-    subject: List[str] = field(default_factory=lambda: [''] * DEFAULT_CAPACITY)
-    teacher_id: List[int] = field(default_factory=lambda: [0] * DEFAULT_CAPACITY)
-    hours: List[int] = field(default_factory=lambda: [0] * DEFAULT_CAPACITY)
+    Stored as parallel arrays that grow with add_subject, so there is no
+    cap on the number of subjects. Subject names are interned, so groups
+    taking the same subjects share the strings.
+    """
+
+    __slots__ = ("id", "name", "subject", "teacher_id", "hours")
+
+    def __init__(self, id: Optional[int] = None, name: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.subject: List[str] = []
+        self.teacher_id = array('i')
+        self.hours = array('H')
+
+    def add_subject(self, subject: str, hours: int, teacher_id: int = 0):
+        self.subject.append(sys.intern(subject))
+        self.hours.append(hours)
+        self.teacher_id.append(teacher_id)
+
+    @property
+    def nosubject(self) -> int:
+        return len(self.subject)
 
     @property
     def num_subjects(self) -> int:
         return self.nosubject
 
-    @num_subjects.setter
-    def num_subjects(self, value: Any):
-        if isinstance(value, str):
-            try:
-                self.nosubject = int(value)
-            except ValueError:
-                
-                raise ValueError(f"Cannot convert '{value}' to an integer for nosubject.")
-        elif isinstance(value, int):
-            self.nosubject = value
-        else:
-            raise TypeError("num_subjects must be an integer or a string representing an integer.")
-
     @property
     def group_name(self) -> Optional[str]:
         return self.name
 
     @group_name.setter
     def group_name(self, value: str):
-        self.name = value
\ No newline at end of file
+        self.name = value
@@ -6,5 +6,6 @@ class Teacher:
     id: Optional[int] = None
     name: Optional[str] = None
     subject: Optional[str] = None
+    subjects: List[str] = field(default_factory=list)
     assigned: int = 0
     unavailable_slots: List[int] = field(default_factory=list)  
\ No newline at end of file
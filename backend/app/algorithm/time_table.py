@@ -10,8 +10,42 @@ class PlaceholderInputData:
         self.nostudentgroup = len(groups)
         self.studentgroup = groups
 
+class GroupTemplate:
+    # Precomputed layout of one group's slots, so Gene construction only has
+    # to shuffle and place integer lists.
+    def __init__(self, slots: List[Optional[Slot]], base: int, days: int, hours: int, lunch_hour: int):
+        subject_to_offsets = {}
+        for local_offset in range(days * hours):
+            slot_obj = slots[base + local_offset]
+            subj_name = None
+            if slot_obj is not None and slot_obj.subject:
+                subj_name = str(slot_obj.subject)
+            subject_to_offsets.setdefault(subj_name, []).append(local_offset)
+        # subject name (None for free periods) -> local offsets, in order
+        self.subject_offsets = subject_to_offsets
+
+        self.blocks: List[List[int]] = []
+        self.singles: List[int] = []
+        for subj, offsets in subject_to_offsets.items():
+            if subj is not None and subj.lower().endswith('_lab') and len(offsets) > 0:
+                self.blocks.append(offsets)
+            else:
+                self.singles.extend(offsets)
+
+        # Valid start positions for each lab block length: the block ends
+        # before the last hour of the day and does not straddle lunch.
+        self.block_starts = {}
+        for m in set(len(block) for block in self.blocks):
+            self.block_starts[m] = [
+                pos for pos in range(days * hours)
+                if pos % hours < hours - m
+                and not (pos % hours < lunch_hour and pos % hours + m > lunch_hour)
+            ]
+
 class TimeTable:
-    slot: List[Optional[Slot]] = []
+    slot: List[Optional[Slot]]
+    templates: List[GroupTemplate]
+    lab_slot: List[bool]
 
     def __init__(self, input_data: PlaceholderInputData):
         days = input_data.daysperweek
@@ -20,7 +54,7 @@ class TimeTable:
         
         total_possible_slots = hours * days * nostgrp
         
-        TimeTable.slot = [None] * total_possible_slots
+        self.slot = [None] * total_possible_slots
         
         k = 0
         for i in range(nostgrp):
@@ -31,13 +65,13 @@ class TimeTable:
     
             for j in range(hours * days):
                 if subject_no >= sg.nosubject:
-                    TimeTable.slot[k] = None 
+                    self.slot[k] = None 
                     k += 1
                 else:
                     current_subject = sg.subject[subject_no]
                     current_teacher_id = sg.teacher_id[subject_no]
                     required_hours = sg.hours[subject_no]
-                    TimeTable.slot[k] = Slot(
+                    self.slot[k] = Slot(
                         student_group=sg, 
                         teacher_id=current_teacher_id, 
                         subject=current_subject
@@ -50,6 +84,14 @@ class TimeTable:
                         hour_count = 1
                         subject_no += 1
 
-    @staticmethod
-    def return_slots() -> List[Optional[Slot]]:
-        return TimeTable.slot
\ No newline at end of file
+        self.lab_slot = [
+            s is not None and bool(s.subject) and str(s.subject).lower().endswith('_lab')
+            for s in self.slot
+        ]
+        self.templates = [
+            GroupTemplate(self.slot, i * hours * days, days, hours, input_data.lunch_hour)
+            for i in range(nostgrp)
+        ]
+
+    def return_slots(self) -> List[Optional[Slot]]:
+        return self.slot
\ No newline at end of file
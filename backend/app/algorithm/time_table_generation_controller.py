@@ -1,9 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
+import json
 import logging
 
-from app.algorithm.time_table_input_transform_service import transform_input
-from app.algorithm.scheduler_main import SchedulerMain
-from app.algorithm.input_data import InputData
+from app.algorithm.time_table_generation_service import (
+    GenerationError,
+    InvalidSettingsError,
+    get_job_queue,
+    run_generation,
+    solver_settings,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -14,26 +19,125 @@ generation_bp = Blueprint("generation", __name__)
 def generate_time_table():
     try:
         data = request.get_json()
-        if not transform_input(data):
+        if not data:
             return jsonify({"message": "Failed to transform input"}), 500
-        
+
+        try:
+            settings = solver_settings(current_app.config, data)
+        except InvalidSettingsError as e:
+            return jsonify({"message": str(e)}), 400
+
         # Run the scheduler directly within Flask context (not as subprocess)
         try:
-            config_data = InputData("/tmp/input.txt")
-            scheduler = SchedulerMain(config_data)
-            
-            # Get the final solution and save it
-            if SchedulerMain.final_son is not None:
-                SchedulerMain.final_son.print_time_table()
-                return jsonify({"message": "Time table generated successfully"}), 200
+            result = run_generation(data, settings)
+
+            if result["status"] == "solved":
+                response = {"message": "Time table generated successfully"}
+                if "profile" in result:
+                    response["profile"] = result["profile"]
+                return jsonify(response), 200
+            elif result["status"] == "partial":
+                # Best effort within the time budget; not saved.
+                return jsonify(dict(result, message="No valid timetable solution found")), 400
             else:
-                logger.warning("Scheduler completed but no valid solution found")
                 return jsonify({"message": "No valid timetable solution found"}), 400
-                
+
+        except GenerationError as e:
+            return jsonify({"message": str(e)}), 500
         except Exception as e:
             logger.error(f"Error running scheduler: {str(e)}", exc_info=True)
             return jsonify({"message": f"Scheduler error: {str(e)}"}), 500
-            
+
     except Exception as e:
         logger.error(f"Unexpected error in generate_time_table: {str(e)}", exc_info=True)
-        return jsonify({"message": f"Unexpected error: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"message": f"Unexpected error: {str(e)}"}), 500
+
+@generation_bp.post("/time-table/stream")
+def stream_time_table():
+    # Runs the generation as a job and streams its progress; closing the
+    # stream cancels the run.
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"message": "No input data provided"}), 400
+
+    try:
+        settings = solver_settings(current_app.config, data)
+    except InvalidSettingsError as e:
+        return jsonify({"message": str(e)}), 400
+
+    queue = get_job_queue(current_app.config)
+    job = queue.submit(data, settings)
+    return _event_stream(queue, job, cancel_on_close=True)
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def _event_stream(queue, job, cancel_on_close=False):
+    def generate():
+        sent = 0
+        try:
+            yield _sse("job", job.to_dict())
+            while True:
+                events = job.wait_for_events(sent, timeout=15.0)
+                for stats in events:
+                    yield _sse("generation", stats)
+                sent += len(events)
+                if job.finished and sent >= len(job.events):
+                    break
+                if not events:
+                    yield ": keep-alive\n\n"
+            yield _sse("done", dict(job.to_dict(), result=job.result))
+        finally:
+            if cancel_on_close and not job.finished:
+                queue.cancel(job.id)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@generation_bp.post("/jobs")
+def create_generation_job():
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"message": "No input data provided"}), 400
+
+    try:
+        settings = solver_settings(current_app.config, data)
+    except InvalidSettingsError as e:
+        return jsonify({"message": str(e)}), 400
+
+    job = get_job_queue(current_app.config).submit(data, settings)
+    return jsonify(job.to_dict()), 202
+
+@generation_bp.get("/jobs/<job_id>")
+def get_generation_job(job_id):
+    job = get_job_queue(current_app.config).get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+@generation_bp.get("/jobs/<job_id>/events")
+def stream_generation_job(job_id):
+    queue = get_job_queue(current_app.config)
+    job = queue.get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return _event_stream(queue, job)
+
+@generation_bp.get("/jobs/<job_id>/result")
+def get_generation_job_result(job_id):
+    job = get_job_queue(current_app.config).get(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    if not job.finished:
+        return jsonify(job.to_dict()), 409
+    return jsonify(dict(job.to_dict(), result=job.result)), 200
+
+@generation_bp.delete("/jobs/<job_id>")
+def cancel_generation_job(job_id):
+    job = get_job_queue(current_app.config).cancel(job_id)
+    if job is None:
+        return jsonify({"message": "Job not found"}), 404
+    return jsonify(job.to_dict()), 202
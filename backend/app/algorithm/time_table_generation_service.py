@@ -0,0 +1,402 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.algorithm.input_data import InputData
+from app.algorithm.island_scheduler import IslandScheduler
+from app.algorithm.local_search import LocalSearchScheduler
+from app.algorithm.population_kernel import NUMPY_AVAILABLE
+from app.algorithm.scheduler_main import SchedulerMain
+from app.algorithm.solver_context import SolverContext
+from app.algorithm.time_table_input_transform_service import render_input, validate_input
+from app.algorithm.time_table_result_cache import canonical_input_key, get_result_cache
+from app.algorithm.time_table_storing_service import load_time_tables, save_time_table
+from app.algorithm.warm_start import affected_groups, genome_from_time_tables
+from app.utils.metrics import observe_solver_run
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationError(Exception):
+    """Raised when a generation request cannot be turned into solver input."""
+
+
+class InvalidSettingsError(GenerationError):
+    """Raised when a request asks for solver options that don't exist."""
+
+
+FITNESS_ENGINES = ("python", "numpy")
+SOLVERS = ("ga", "annealing", "tabu")
+
+
+def _fitness_engine(data: Dict[str, Any]) -> str:
+    engine = data.get("fitness_engine", "python")
+    if engine not in FITNESS_ENGINES:
+        raise InvalidSettingsError(f"Unknown fitness_engine '{engine}' (expected one of {', '.join(FITNESS_ENGINES)})")
+    if engine == "numpy" and not NUMPY_AVAILABLE:
+        logger.warning("numpy is not installed; using the python fitness engine")
+        return "python"
+    return engine
+
+
+def _limit(data: Dict[str, Any], name: str, default: Any) -> Any:
+    # A stopping limit from the request, or the configured default; 0 means
+    # no limit, as in Config.
+    value = data.get(name, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidSettingsError(f"{name} must be a positive number, got {value!r}")
+    if value == 0:
+        return None
+    if not value > 0:
+        raise InvalidSettingsError(f"{name} must be a positive number, got {value!r}")
+    return value
+
+
+def solver_settings(app_config: Any, data: Dict[str, Any]) -> Dict[str, Any]:
+    # Snapshot of the solver configuration for one run, taken inside the
+    # request so background jobs don't need the Flask app context.
+    solver = data.get("solver", app_config.get("SOLVER_ALGORITHM", "ga"))
+    if solver not in SOLVERS:
+        raise InvalidSettingsError(f"Unknown solver '{solver}' (expected one of {', '.join(SOLVERS)})")
+
+    return {
+        "solver": solver,
+        "fitness_engine": _fitness_engine(data),
+        "mutation": app_config.get("SOLVER_MUTATION", "repair"),
+        "repair_attempts": app_config.get("SOLVER_REPAIR_ATTEMPTS", 100),
+        "workers": app_config.get("SOLVER_WORKERS", 1),
+        "chunk_size": app_config.get("SOLVER_CHUNK_SIZE"),
+        "islands": app_config.get("SOLVER_ISLANDS", 1),
+        "migration_interval": app_config.get("SOLVER_MIGRATION_INTERVAL", 5),
+        "migrants": app_config.get("SOLVER_MIGRANTS", 5),
+        "time_budget": _limit(data, "time_budget", app_config.get("SOLVER_TIME_BUDGET")),
+        "stall_generations": _limit(data, "stall_generations", app_config.get("SOLVER_STALL_GENERATIONS")),
+        "ls_iterations": app_config.get("SOLVER_LS_ITERATIONS", 200000),
+        "ls_stall_iterations": app_config.get("SOLVER_LS_STALL_ITERATIONS"),
+        "selection": app_config.get("SOLVER_SELECTION", "roulette"),
+        "profile": bool(data.get("profile", app_config.get("SOLVER_PROFILE", False))),
+        "greedy_fraction": app_config.get("SOLVER_GREEDY_FRACTION", 0.2),
+        "fitness_cache_size": app_config.get("SOLVER_FITNESS_CACHE_SIZE", 0),
+        "cache_size": app_config.get("SOLVER_CACHE_SIZE", 100) if data.get("use_cache", True) else 0,
+        "warm_start_fraction": (
+            app_config.get("SOLVER_WARM_START_FRACTION", 0.2) if data.get("warm_start", True) else 0.0
+        ),
+    }
+
+
+def load_context(data: Dict[str, Any]) -> SolverContext:
+    # Built in memory: no input file, so concurrent runs can't clash.
+    if not validate_input(data):
+        raise GenerationError("Failed to transform input")
+    context = SolverContext(InputData.from_payload(data))
+    context.input_key = canonical_input_key("\n".join(render_input(data)))
+    return context
+
+
+def run_generation(
+    data: Dict[str, Any],
+    settings: Dict[str, Any],
+    on_generation: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """Runs the GA for one request and stores the timetable if it is solved.
+
+    Returns {"status": "solved" | "partial" | "cancelled", "timetable": ...}.
+    A partial result is the best timetable found before the run stopped,
+    with its remaining conflicts; it is not stored.
+
+    Solved results are cached by input hash (settings["cache_size"] > 0),
+    and concurrent runs of the same input share one solve.
+    """
+    settings = dict(settings)
+    cache_size = settings.pop("cache_size", 0)
+    context = load_context(data)
+    if cache_size <= 0:
+        return _solve(context, data, settings, on_generation, cancel_event)
+
+    cache = get_result_cache(cache_size)
+    key = context.input_key
+    while True:
+        timetable = cache.get(key)
+        if timetable is not None:
+            logger.info(f"Returning cached timetable for input {key}")
+            save_time_table(timetable)
+            return {"status": "solved", "stop_reason": "cached", "timetable": timetable, "conflicts": []}
+
+        entry = cache.begin(key)
+        if entry is None:
+            break
+        while not entry["done"].wait(0.5):
+            if cancel_event is not None and cancel_event.is_set():
+                return {"status": "cancelled", "stop_reason": "cancelled", "timetable": None, "conflicts": []}
+        # Reuse the other run's result unless it never finished.
+        if entry["result"] is not None and entry["result"]["status"] != "cancelled":
+            return entry["result"]
+
+    result = None
+    try:
+        result = _solve(context, data, settings, on_generation, cancel_event)
+        if result["status"] == "solved":
+            cache.put(key, result["timetable"])
+    finally:
+        cache.finish(key, result)
+    return result
+
+
+def _solve(
+    context: SolverContext,
+    data: Dict[str, Any],
+    settings: Dict[str, Any],
+    on_generation: Optional[Callable[[Dict[str, Any]], None]],
+    cancel_event: Optional[threading.Event],
+) -> Dict[str, Any]:
+    islands = settings.pop("islands", 1)
+    migration_interval = settings.pop("migration_interval", 5)
+    migrants = settings.pop("migrants", 5)
+    workers = settings.pop("workers", 1)
+    chunk_size = settings.pop("chunk_size", None)
+    solver = settings.pop("solver", "ga")
+    ls_iterations = settings.pop("ls_iterations", 200000)
+    ls_stall_iterations = settings.pop("ls_stall_iterations", None)
+    # Profiling covers the GA and its breeding pool, not island runs.
+    profile = settings.pop("profile", False)
+
+    # changed_teachers asks for an incremental re-solve: only the groups
+    # those teachers teach (and groups with no stored timetable) change.
+    changed_teachers = data.get("changed_teachers") or []
+    if settings.get("warm_start_fraction", 0.0) > 0 or changed_teachers:
+        try:
+            tables = load_time_tables([group.name for group in context.groups])
+        except Exception as e:
+            # Warm starting is an optimisation; solve from scratch instead.
+            logger.warning(f"Loading stored timetables failed, starting cold: {str(e)}")
+            tables = {}
+        settings["warm_start"] = genome_from_time_tables(context, tables)
+        if settings["warm_start"] is not None:
+            logger.info(f"Warm-starting from {len(tables)} stored timetables")
+
+        if changed_teachers and settings["warm_start"] is not None:
+            mutable = set(affected_groups(context, changed_teachers))
+            mutable.update(i for i, group in enumerate(context.groups) if group.name not in tables)
+            if mutable:
+                settings["mutable_groups"] = sorted(mutable)
+                logger.info(f"Re-solving {len(mutable)} of {len(context.groups)} groups")
+
+    started = time.perf_counter()
+    if solver in ("annealing", "tabu"):
+        scheduler = LocalSearchScheduler(
+            context,
+            method=solver,
+            max_iterations=ls_iterations,
+            stall_iterations=ls_stall_iterations,
+            time_budget=settings.get("time_budget"),
+            warm_start=settings.get("warm_start"),
+            mutable_groups=settings.get("mutable_groups"),
+            on_generation=on_generation,
+            cancel_event=cancel_event,
+        )
+    elif solver != "ga":
+        raise GenerationError(f"Unknown solver: {solver}")
+    elif islands > 1:
+        scheduler = IslandScheduler(
+            context,
+            islands=islands,
+            migration_interval=migration_interval,
+            migrants=migrants,
+            on_generation=on_generation,
+            cancel_event=cancel_event,
+            **settings
+        )
+    else:
+        scheduler = SchedulerMain(
+            context,
+            workers=workers,
+            chunk_size=chunk_size,
+            on_generation=on_generation,
+            cancel_event=cancel_event,
+            profile=profile,
+            **settings
+        )
+
+    elapsed = time.perf_counter() - started
+
+    if context.final_son is not None:
+        result = {
+            "status": "solved",
+            "stop_reason": scheduler.stop_reason,
+            "timetable": context.final_son.print_time_table(),
+            "conflicts": [],
+        }
+    elif scheduler.cancelled or scheduler.best is None:
+        result = {"status": "cancelled", "stop_reason": scheduler.stop_reason, "timetable": None, "conflicts": []}
+    else:
+        best = scheduler.best
+        logger.warning(f"Scheduler stopped ({scheduler.stop_reason}) without a valid solution; best fitness {best.fitness}")
+        result = {
+            "status": "partial",
+            "stop_reason": scheduler.stop_reason,
+            "fitness": best.fitness,
+            "timetable": best.to_time_table_dict(),
+            "conflicts": best.conflict_report(),
+        }
+
+    observe_solver_run(
+        solver,
+        result["status"],
+        elapsed,
+        getattr(scheduler, "generation", getattr(scheduler, "iteration", 0)),
+        scheduler.best.fitness if scheduler.best is not None else None,
+        getattr(scheduler, "mutation_attempts", 0),
+    )
+
+    solver_profile = getattr(scheduler, "profile", None)
+    if solver_profile is not None:
+        logger.info(f"Solver profile: {solver_profile.summary()}")
+        result["profile"] = solver_profile.to_dict()
+    fitness_cache = getattr(scheduler, "fitness_cache", None)
+    if fitness_cache is not None:
+        logger.info(f"Fitness cache: {fitness_cache.stats()}")
+        if solver_profile is not None:
+            result["profile"]["fitness_cache"] = fitness_cache.stats()
+    return result
+
+
+class GenerationJob:
+    """One queued timetable generation and its observable state."""
+
+    def __init__(self, data: Dict[str, Any], settings: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.data = data
+        self.settings = settings
+        self.status = "queued"
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        # Per-generation statistics in order, for streaming; the condition
+        # is notified whenever one is added or the job finishes.
+        self.events: List[Dict[str, Any]] = []
+        self.condition = threading.Condition()
+
+    def record(self, stats: Dict[str, Any]):
+        with self.condition:
+            self.progress = stats
+            self.events.append(stats)
+            self.condition.notify_all()
+
+    def notify(self):
+        with self.condition:
+            self.condition.notify_all()
+
+    def wait_for_events(self, start: int, timeout: float) -> List[Dict[str, Any]]:
+        # Returns events[start:], waiting up to timeout for new ones.
+        with self.condition:
+            if len(self.events) <= start and not self.finished:
+                self.condition.wait(timeout)
+            return self.events[start:]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class GenerationJobQueue:
+    """In-process job queue: generations run on a small thread pool so the
+    Flask worker that submitted them returns immediately.
+    """
+
+    def __init__(self, workers: int = 1, history: int = 100):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="timetable-job")
+        self.history = history
+        self.jobs: Dict[str, GenerationJob] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, data: Dict[str, Any], settings: Dict[str, Any]) -> GenerationJob:
+        job = GenerationJob(data, settings)
+        with self.lock:
+            self._prune()
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[GenerationJob]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        with self.lock:
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = time.time()
+        job.notify()
+        return job
+
+    def _run(self, job: GenerationJob):
+        with self.lock:
+            if job.status != "queued":
+                return
+            job.status = "running"
+            job.started_at = time.time()
+
+        try:
+            result = run_generation(job.data, job.settings, job.record, job.cancel_event)
+            with self.lock:
+                job.result = result
+                job.status = "cancelled" if result["status"] == "cancelled" else "completed"
+        except Exception as e:
+            logger.error(f"Generation job {job.id} failed: {str(e)}", exc_info=True)
+            with self.lock:
+                job.error = str(e)
+                job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            # The payload is only needed to run the job.
+            job.data = None
+            job.notify()
+
+    def _prune(self):
+        finished: List[GenerationJob] = [j for j in self.jobs.values() if j.finished]
+        excess = len(finished) - self.history
+        if excess <= 0:
+            return
+        finished.sort(key=lambda j: j.finished_at or j.created_at)
+        for job in finished[:excess]:
+            del self.jobs[job.id]
+
+
+_job_queue: Optional[GenerationJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue(app_config: Any) -> GenerationJobQueue:
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = GenerationJobQueue(
+                workers=app_config.get("SOLVER_JOB_WORKERS", 1),
+                history=app_config.get("SOLVER_JOB_HISTORY", 100),
+            )
+        return _job_queue
@@ -4,12 +4,14 @@ from flask import request, jsonify
 from pydantic import ValidationError
 
 def is_lab_teacher(teacher_name, teachers_data):
-    """Check if a teacher is a lab teacher based on their subject"""
+    """Check if a teacher is a lab teacher based on their subject.
+    A teacher with several subjects only counts if all of them are labs,
+    so their lecture periods keep their own unavailability."""
     for teacher in teachers_data:
         if teacher.get('name') == teacher_name:
             subject = teacher.get('subject', '')
             if isinstance(subject, list):
-                return any(s.lower().endswith('_lab') for s in subject)
+                return bool(subject) and all(s.lower().endswith('_lab') for s in subject)
             return subject.lower().endswith('_lab')
     return False
 
@@ -39,71 +41,78 @@ def combine_lab_availability(teacherunavailability_data, teachers_data):
     
     return combined_availability
 
-def transform_input(input_data=None):
-    try:
-        if input_data is None:
-            data = request.json
-        else:
-            data = input_data
-        
-        if not data:
-            print("Error: No data provided")
-            return False
-            
-        # Validate required fields
-        required_fields = ['studentgroups', 'teacherunavailability', 'teachers']
-        for field in required_fields:
-            if field not in data:
-                print(f"Error: Missing required field '{field}'")
-                return False
-                
-    except Exception as e:
-        print(f"Error getting input data: {e}")
+def validate_input(data) -> bool:
+    if not data:
+        print("Error: No data provided")
         return False
-    
-    print(f"Transforming input data: {data}")  # For debugging purposes
+
+    # Validate required fields
+    required_fields = ['studentgroups', 'teacherunavailability', 'teachers']
+    for field in required_fields:
+        if field not in data:
+            print(f"Error: Missing required field '{field}'")
+            return False
+    return True
+
+def render_input(data):
+    """Returns the lines of the input file format for a validated payload"""
     output = []
 
     # Student Groups
     output.append('studentgroups')
-    if 'studentgroups' in data:
-        for sg in data['studentgroups']:
-            line = [sg['group']]
-            for s, c in sg['subjects'].items():
-                line.append(s)
-                line.append(str(c))
-            output.append(" ".join(line))
+    for sg in data['studentgroups']:
+        line = [sg['group']]
+        for s, c in sg['subjects'].items():
+            line.append(s)
+            line.append(str(c))
+        output.append(" ".join(line))
     output.append("end")
 
     # Teachers
     output.append("teachers")
-    if 'teachers' in data:
-        for t in data.get("teachers", []):
-            subject = t["subject"]
-            if isinstance(subject, list):
-                subject = ", ".join(subject)
-            output.append(f"{t['name']} {subject}")
+    for t in data.get("teachers", []):
+        subject = t["subject"]
+        if isinstance(subject, list):
+            subject = ", ".join(subject)
+        output.append(f"{t['name']} {subject}")
     output.append("end")
 
     # Unavailability - use combined lab availability
     output.append("teacherunavailability")
-    if 'teacherunavailability' in data and 'teachers' in data:
-        # Get combined availability for labs
-        combined_availability = combine_lab_availability(
-            data["teacherunavailability"], 
-            data["teachers"]
-        )
-        
-        # Write non-lab teachers and combined labs availability
-        for ua in combined_availability:
-            output.append(f"{ua['name']} " + " ".join(str(s) for s in ua["slots"]))
+    combined_availability = combine_lab_availability(
+        data["teacherunavailability"], 
+        data["teachers"]
+    )
+    
+    # Write non-lab teachers and combined labs availability
+    for ua in combined_availability:
+        output.append(f"{ua['name']} " + " ".join(str(s) for s in ua["slots"]))
     output.append("end")
+    return output
+
+def transform_input(input_data=None, output_path="/tmp/input.txt"):
+    """Writes the payload in the input file format (InputData can also be
+    built from the payload directly, see InputData.from_payload)"""
+    try:
+        if input_data is None:
+            data = request.json
+        else:
+            data = input_data
+        
+        if not validate_input(data):
+            return False
+                
+    except Exception as e:
+        print(f"Error getting input data: {e}")
+        return False
+    
+    print(f"Transforming input data: {data}")  # For debugging purposes
+    output = render_input(data)
 
     try:
-        INPUT_FILE_PATH = "/tmp/input.txt"
-        with open(INPUT_FILE_PATH, "w") as f:
+        with open(output_path, "w") as f:
             f.write("\n".join(output))
-        print(f"Successfully wrote input file to {INPUT_FILE_PATH}")
+        print(f"Successfully wrote input file to {output_path}")
         return True
     except Exception as e:
         print(f"Error writing input file: {e}")
@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.db import time_table_cache_collection
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_input_key(input_text: str) -> str:
+    """Hash of the solver input in the input file format (render_input).
+
+    Whitespace is normalised and the unavailability section is sorted by
+    teacher (keeping the last entry per name, as InputData does), since its
+    order doesn't change the problem. Student groups and teachers keep
+    their order, because it decides teacher assignment: ties go to the
+    lowest teacher index.
+    """
+    sections = []
+    current = None
+    for line in input_text.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            continue
+        lowered = line.lower()
+        if lowered in ("studentgroups", "teachers", "teacherunavailability"):
+            current = [lowered]
+            sections.append(current)
+        elif lowered == "end" or current is None:
+            current = None
+        else:
+            current.append(line)
+
+    canonical = []
+    for section in sections:
+        body = section[1:]
+        if section[0] == "teacherunavailability":
+            latest = {line.split()[0].lower(): line for line in body}
+            body = [latest[name] for name in sorted(latest)]
+        canonical.append("\n".join([section[0]] + body))
+    return hashlib.sha256("\n\n".join(canonical).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Solved timetables keyed by canonical input hash, persisted in Mongo
+    and evicted least-recently-used beyond max_entries.
+
+    Concurrent solves of the same key are collapsed: the first caller runs
+    the solve and the others wait for its result.
+    """
+
+    def __init__(self, collection: Any, max_entries: int = 100):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.in_flight: Dict[str, Dict[str, Any]] = {}
+
+    # A cache failure only costs a re-solve, so errors are logged, not raised.
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            doc = self.collection.find_one({"_id": key})
+            if doc is None:
+                return None
+            self.collection.update_one({"_id": key}, {"$set": {"last_used": time.time()}})
+            return doc["timetable"]
+        except Exception as e:
+            logger.warning(f"Timetable cache lookup failed: {str(e)}")
+            return None
+
+    def put(self, key: str, timetable: Dict[str, Any]):
+        now = time.time()
+        try:
+            self.collection.replace_one(
+                {"_id": key},
+                {"_id": key, "timetable": timetable, "created_at": now, "last_used": now},
+                upsert=True,
+            )
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Timetable cache store failed: {str(e)}")
+
+    def _evict(self):
+        excess = self.collection.count_documents({}) - self.max_entries
+        if excess <= 0:
+            return
+        oldest = self.collection.find({}, {"_id": 1}).sort("last_used", 1).limit(excess)
+        self.collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+    def begin(self, key: str) -> Optional[Dict[str, Any]]:
+        # Returns None if the caller should run the solve (and call finish),
+        # otherwise the in-flight entry to wait on.
+        with self.lock:
+            entry = self.in_flight.get(key)
+            if entry is None:
+                self.in_flight[key] = {"done": threading.Event(), "result": None}
+                return None
+            return entry
+
+    def finish(self, key: str, result: Optional[Dict[str, Any]]):
+        with self.lock:
+            entry = self.in_flight.pop(key, None)
+        if entry is not None:
+            entry["result"] = result
+            entry["done"].set()
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache(max_entries: int) -> ResultCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(time_table_cache_collection, max_entries)
+        _cache.max_entries = max_entries
+        return _cache
@@ -1,6 +1,7 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from app.utils.db import time_table_collection
+from app.services.availability_update_service import update_availability_after_timetable
 
 def store_time_table(timetable_dict: Dict[str, Any]) -> Dict[str, Any]:
     summary = {"updated": [], "upserted": [], "errors": {}}
@@ -18,4 +19,22 @@ def store_time_table(timetable_dict: Dict[str, Any]) -> Dict[str, Any]:
         except Exception as ex:
             summary["errors"][class_id] = str(ex)
 
-    return summary
\ No newline at end of file
+    return summary
+
+def save_time_table(timetable_dict: Dict[str, Any]):
+    # Stores a generated timetable and updates teacher availability from it.
+    print(timetable_dict)
+    print(store_time_table(timetable_dict))
+
+    # Update availability after timetable creation
+    availability_update_result = update_availability_after_timetable()
+    print("Availability update result:", availability_update_result)
+
+
+def load_time_tables(class_ids: List[str]) -> Dict[str, Dict[str, List[int]]]:
+    # class_id -> subject -> week positions, for the classes that have one stored
+    tables = {}
+    for doc in time_table_collection.find({"class_id": {"$in": list(class_ids)}}):
+        if isinstance(doc.get("ttable"), dict):
+            tables[doc["class_id"]] = doc["ttable"]
+    return tables
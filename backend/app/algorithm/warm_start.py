@@ -0,0 +1,81 @@
+import random
+from array import array
+from typing import Dict, List, Optional
+
+from app.algorithm.gene import Gene, slot_typecode
+from app.algorithm.solver_context import SolverContext
+
+
+def genome_from_time_tables(context: SolverContext, tables: Dict[str, Dict[str, List[int]]]) -> Optional[array]:
+    """Maps stored timetables (class_id -> subject -> positions, as written by
+    store_time_table) back onto slot table indices.
+
+    Groups without a stored timetable get a random Gene, and periods the
+    stored timetable no longer accounts for (changed hours, new subjects)
+    fill the remaining positions randomly. Returns None when no group has a
+    stored timetable.
+    """
+    config = context.config
+    total_slots = config.daysperweek * config.hoursperday
+    genome = array(slot_typecode(len(context.slots)))
+    matched = False
+
+    for group_index, group in enumerate(context.groups):
+        stored = tables.get(group.name)
+        if not stored:
+            genome.extend(Gene(group_index, context).slotno)
+            continue
+        matched = True
+
+        template = context.timetable.templates[group_index]
+        placement: List[Optional[int]] = [None] * total_slots
+        used = set()
+        for subject, positions in stored.items():
+            offsets = template.subject_offsets.get(subject, [])
+            valid = sorted(p for p in set(positions) if isinstance(p, int) and 0 <= p < total_slots)
+            for pos, offset in zip(valid, offsets):
+                if placement[pos] is None:
+                    placement[pos] = offset
+                    used.add(offset)
+
+        remaining = [o for o in range(total_slots) if o not in used]
+        random.shuffle(remaining)
+        free = [pos for pos, offset in enumerate(placement) if offset is None]
+        for pos, offset in zip(free, remaining):
+            placement[pos] = offset
+
+        base = group_index * total_slots
+        genome.extend(base + offset for offset in placement)
+
+    return genome if matched else None
+
+
+def perturb_genome(context: SolverContext, genome: array, swaps: int, groups: Optional[List[int]] = None) -> array:
+    # Copy of genome with up to `swaps` random swaps of two non-lab periods
+    # within one group (of `groups`, if given), so lab blocks stay contiguous.
+    config = context.config
+    total_slots = config.daysperweek * config.hoursperday
+    lab_slot = context.timetable.lab_slot
+    groups = list(groups) if groups is not None else list(range(config.nostudentgroup))
+    genome = genome[:]
+    if not groups:
+        return genome
+    for _ in range(swaps):
+        start = random.choice(groups) * total_slots
+        p1 = start + random.randrange(total_slots)
+        p2 = start + random.randrange(total_slots)
+        if lab_slot[genome[p1]] or lab_slot[genome[p2]]:
+            continue
+        genome[p1], genome[p2] = genome[p2], genome[p1]
+    return genome
+
+
+def affected_groups(context: SolverContext, teacher_names: List[str]) -> List[int]:
+    # Indices of the groups taught by any of the named teachers.
+    names = set(name.lower() for name in teacher_names)
+    teacher_ids = set(t.id for t in context.teachers if t.name.lower() in names)
+    affected = []
+    for group_index, group in enumerate(context.groups):
+        if any(group.teacher_id[j] in teacher_ids for j in range(group.nosubject)):
+            affected.append(group_index)
+    return affected
@@ -32,4 +32,57 @@ class Config:
     SLOTS_PER_DAY = int(os.getenv("SLOTS_PER_DAY", "7"))
     DAYS_PER_WEEK = int(os.getenv("DAYS_PER_WEEK", "5"))
     LUNCH_HOUR = int(os.getenv("LUNCH_HOUR", "3"))
-    MAX_UNAVAILABLE_FRACTION = float(os.getenv("MAX_UNAVAILABLE_FRACTION", "0.95"))
\ No newline at end of file
+    MAX_UNAVAILABLE_FRACTION = float(os.getenv("MAX_UNAVAILABLE_FRACTION", "0.95"))
+
+    # Default solver: "ga", or single-solution local search ("annealing" or
+    # "tabu") with its step budget and stall limit (0 = none)
+    SOLVER_ALGORITHM = os.getenv("SOLVER_ALGORITHM", "ga")
+    SOLVER_LS_ITERATIONS = int(os.getenv("SOLVER_LS_ITERATIONS", "200000"))
+    SOLVER_LS_STALL_ITERATIONS = int(os.getenv("SOLVER_LS_STALL_ITERATIONS", "0")) or None
+
+    # Process-pool breeding for the timetable GA (1 = serial)
+    SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", "1"))
+    SOLVER_CHUNK_SIZE = int(os.getenv("SOLVER_CHUNK_SIZE", "0")) or None
+
+    # Island-model GA: independent populations with periodic migration (1 = off)
+    SOLVER_ISLANDS = int(os.getenv("SOLVER_ISLANDS", "1"))
+    SOLVER_MIGRATION_INTERVAL = int(os.getenv("SOLVER_MIGRATION_INTERVAL", "5"))
+    SOLVER_MIGRANTS = int(os.getenv("SOLVER_MIGRANTS", "5"))
+
+    # GA mutation operator ("repair" or "regenerate") and its attempt budget
+    SOLVER_MUTATION = os.getenv("SOLVER_MUTATION", "repair")
+    SOLVER_REPAIR_ATTEMPTS = int(os.getenv("SOLVER_REPAIR_ATTEMPTS", "100"))
+
+    # Stop a generation after this many seconds, or after this many
+    # generations without improvement (0 = no limit); the best timetable
+    # found so far is returned with its remaining conflicts
+    SOLVER_TIME_BUDGET = float(os.getenv("SOLVER_TIME_BUDGET", "0")) or None
+    SOLVER_STALL_GENERATIONS = int(os.getenv("SOLVER_STALL_GENERATIONS", "0")) or None
+
+    # Share of the first population seeded from the timetables already in
+    # time_table_collection (0 = always start from random)
+    SOLVER_WARM_START_FRACTION = float(os.getenv("SOLVER_WARM_START_FRACTION", "0.2"))
+
+    # GA parent selection: "roulette" or "tournament"
+    SOLVER_SELECTION = os.getenv("SOLVER_SELECTION", "roulette")
+
+    # Share of the first GA population built by the greedy constructive
+    # initializer (0 = all random)
+    SOLVER_GREEDY_FRACTION = float(os.getenv("SOLVER_GREEDY_FRACTION", "0.2"))
+
+    # Collect per-phase solver timers and counters (also per request with
+    # "profile": true)
+    SOLVER_PROFILE = os.getenv("SOLVER_PROFILE", "false").lower() == "true"
+
+    # Crossover children's fitness kept in an LRU keyed by genome hash
+    # (0 = no cache)
+    SOLVER_FITNESS_CACHE_SIZE = int(os.getenv("SOLVER_FITNESS_CACHE_SIZE", "0"))
+
+    # Solved timetables kept in the result cache, keyed by input hash
+    # (0 = no caching)
+    SOLVER_CACHE_SIZE = int(os.getenv("SOLVER_CACHE_SIZE", "100"))
+
+    # Background generation jobs: concurrent solver threads and how many
+    # finished jobs are kept for polling
+    SOLVER_JOB_WORKERS = int(os.getenv("SOLVER_JOB_WORKERS", "1"))
+    SOLVER_JOB_HISTORY = int(os.getenv("SOLVER_JOB_HISTORY", "100"))
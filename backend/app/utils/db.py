@@ -1,9 +1,12 @@
 from pymongo import MongoClient
 from dotenv import load_dotenv
 import os
+
+from app.utils.metrics import mongo_command_metrics
+
 load_dotenv()
 
-client = MongoClient(os.getenv("MONGO_URI"))
+client = MongoClient(os.getenv("MONGO_URI"), event_listeners=[mongo_command_metrics])
 db = client["timetable"]
 
 classes_collection = db["classes"]
@@ -11,4 +14,5 @@ teachers_collection = db["teachers"]
 availability_collection = db["availability"]
 time_table_collection = db["time_table"]
 input_data_collection = db["input_data"]
-invigilator_collection = db["invigilator"]
\ No newline at end of file
+invigilator_collection = db["invigilator"]
+time_table_cache_collection = db["time_table_cache"]
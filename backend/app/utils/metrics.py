@@ -0,0 +1,244 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, Response, g, request
+from pymongo import monitoring
+
+# Minimal Prometheus text-format metrics (no client library dependency).
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SOLVER_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [per-bucket counts..., sum, count]
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, entry in sorted(self.values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(entry[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by blueprint.",
+    ("blueprint", "method", "status"),
+))
+http_requests_in_flight = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("blueprint",),
+))
+mongo_command_duration = REGISTRY.register(Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency.", ("command", "collection", "outcome"),
+))
+solver_run_duration = REGISTRY.register(Histogram(
+    "solver_run_duration_seconds", "Timetable solver run time.", ("solver", "status"), buckets=SOLVER_BUCKETS,
+))
+solver_runs = REGISTRY.register(Counter(
+    "solver_runs_total", "Timetable solver runs.", ("solver", "status"),
+))
+solver_generations = REGISTRY.register(Counter(
+    "solver_generations_total", "GA generations (or local search steps) run.", ("solver",),
+))
+solver_mutation_attempts = REGISTRY.register(Counter(
+    "solver_mutation_attempts_total", "GA mutation attempts.", ("solver",),
+))
+solver_final_fitness = REGISTRY.register(Histogram(
+    "solver_final_fitness", "Best fitness at the end of a solver run.", ("solver",),
+    buckets=(0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 1.0),
+))
+solver_last_fitness = REGISTRY.register(Gauge(
+    "solver_last_final_fitness", "Best fitness of the most recent solver run.", ("solver",),
+))
+
+
+def observe_solver_run(
+    solver: str,
+    status: str,
+    seconds: float,
+    generations: int,
+    fitness: Optional[float],
+    mutation_attempts: int = 0,
+):
+    solver_run_duration.observe(seconds, solver=solver, status=status)
+    solver_runs.inc(solver=solver, status=status)
+    solver_generations.inc(generations, solver=solver)
+    solver_mutation_attempts.inc(mutation_attempts, solver=solver)
+    if fitness is not None:
+        solver_final_fitness.observe(fitness, solver=solver)
+        solver_last_fitness.set(fitness, solver=solver)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command; pass to MongoClient(event_listeners=[...])."""
+
+    def __init__(self):
+        self.pending: Dict[Tuple[str, int], Tuple[str, str]] = {}
+        self.lock = threading.Lock()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ""
+        with self.lock:
+            self.pending[(event.connection_id, event.request_id)] = (event.command_name, collection)
+
+    def _finish(self, event, outcome: str):
+        with self.lock:
+            command, collection = self.pending.pop(
+                (event.connection_id, event.request_id), (event.command_name, "")
+            )
+        mongo_command_duration.observe(
+            event.duration_micros / 1e6, command=command, collection=collection, outcome=outcome
+        )
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+def init_metrics(app: Flask):
+    """Times every request by blueprint and serves /metrics."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        g.metrics_blueprint = request.blueprint or "app"
+        http_requests_in_flight.inc(blueprint=g.metrics_blueprint)
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                blueprint=g.metrics_blueprint, method=request.method, status=str(response.status_code),
+            )
+        return response
+
+    @app.teardown_request
+    def _end_request(exc):
+        blueprint = g.pop("metrics_blueprint", None)
+        if blueprint is not None:
+            http_requests_in_flight.dec(blueprint=blueprint)
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,198 @@
+"""Micro-benchmark for Gene construction.
+
+Compares Gene construction from the per-group templates precomputed by
+TimeTable ("after") with the constructor Gene had before templates
+("before", copied below as BaselineGene: it rebuilt the group's subject
+map on every call and placed labs by scanning shuffled free positions).
+
+    python benchmarks/gene_construction.py --groups 40 --repeat 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from typing import Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the app package builds the Flask config, which needs these set.
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark")
+
+from app.algorithm.gene import Gene, slot_typecode
+from app.algorithm.input_data import InputData
+from app.algorithm.solver_context import SolverContext
+
+SUBJECTS = [("Maths", 5), ("Physics", 4), ("Chemistry", 4), ("English", 3),
+            ("Biology", 3), ("Computing", 4), ("Physics_lab", 2), ("Computing_lab", 2)]
+
+
+def write_input(path: str, groups: int):
+    teachers_per_subject = max(1, (groups + 3) // 4)
+    lines = ["studentgroups"]
+    for g in range(groups):
+        lines.append(f"G{g} " + " ".join(f"{name} {hours}" for name, hours in SUBJECTS))
+    lines += ["end", "teachers"]
+    for name, _ in SUBJECTS:
+        for k in range(teachers_per_subject):
+            lines.append(f"{name}T{k} {name}")
+    lines += ["end", "teacherunavailability", "end"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+class BaselineGene:
+    # Gene as it was before per-group templates, verbatim except that the
+    # slot table is an argument instead of the old class-level TimeTable.slot.
+    
+    slotno: array
+    
+    def __init__(self, group_index: int, config: Any, slots: List[Any]):
+        self.days = config.daysperweek
+        self.hours = config.hoursperday
+        self.total_slots = self.days * self.hours
+        
+        slot_base_index = group_index * self.total_slots
+        local_indices = list(range(self.total_slots))
+
+        subject_to_offsets = {}
+        for local_offset in local_indices:
+            global_index = slot_base_index + local_offset
+            slot_obj = None
+            try:
+                slot_obj = slots[global_index]
+            except Exception:
+                slot_obj = None
+
+            subj_name = None
+            if slot_obj is not None and hasattr(slot_obj, 'subject') and slot_obj.subject:
+                subj_name = str(slot_obj.subject)
+            else:
+                subj_name = None
+
+            subject_to_offsets.setdefault(subj_name, []).append(local_offset)
+
+        blocks: List[List[int]] = []
+        singles: List[int] = []
+
+        for subj, offsets in subject_to_offsets.items():
+            if subj is not None and subj.lower().endswith('_lab') and len(offsets) > 0:
+                blocks.append(list(offsets))
+            else:
+                singles.extend(offsets)
+
+        random.shuffle(blocks)
+        random.shuffle(singles)
+
+        placement = [None] * self.total_slots
+        free_positions = set(range(self.total_slots))
+
+        def find_block_position(m):
+            candidates = list(free_positions)
+            random.shuffle(candidates)
+
+            for pos in candidates:
+                day_hour = pos % self.hours
+
+                if day_hour >= self.hours - m:
+                    continue
+                
+                L = config.lunch_hour
+                crosses_lunch = (
+                    day_hour < L and day_hour + m > L
+                )
+
+                if crosses_lunch:
+                    continue
+
+                ok = True
+                for q in range(pos, pos + m):
+                    if q not in free_positions:
+                        ok = False
+                        break
+                if ok:
+                    return pos
+            return None
+
+        for block in blocks:
+            m = len(block)
+            start = find_block_position(m)
+            if start is None:
+                seq_start = None
+                sorted_free = sorted(free_positions)
+                for idx in range(len(sorted_free) - m + 1):
+                    if sorted_free[idx + m - 1] - sorted_free[idx] == m - 1:
+                        seq_start = sorted_free[idx]
+                        break
+                if seq_start is None:
+                    chosen = []
+                    for _ in range(m):
+                        p = random.choice(list(free_positions))
+                        chosen.append(p)
+                        free_positions.remove(p)
+                    for i_offset, local_off in enumerate(block):
+                        placement[chosen[i_offset]] = local_off
+                    continue
+                else:
+                    start = seq_start
+            for idx_in_block, local_off in enumerate(block):
+                pos = start + idx_in_block
+                placement[pos] = local_off
+                free_positions.remove(pos)
+
+        remaining_positions = list(free_positions)
+        random.shuffle(remaining_positions)
+        for pos, local_off in zip(remaining_positions, singles):
+            placement[pos] = local_off
+
+        assigned_local_offsets = set(x for x in placement if x is not None)
+        remaining_offsets = [o for o in local_indices if o not in assigned_local_offsets]
+        remaining_positions = [i for i, v in enumerate(placement) if v is None]
+        random.shuffle(remaining_offsets)
+
+        for pos, local_off in zip(remaining_positions, remaining_offsets):
+            placement[pos] = local_off
+
+        self.slotno = array(slot_typecode(len(slots)), [0] * self.total_slots)
+        for j in range(self.total_slots):
+            local_offset = placement[j]
+            if local_offset is None:
+                local_offset = j
+            self.slotno[j] = slot_base_index + local_offset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        write_input(path, args.groups)
+        config = InputData(path)
+    context = SolverContext(config)
+
+    slots = context.slots
+
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        BaselineGene(i % config.nostudentgroup, config, slots)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        Gene(i % config.nostudentgroup, context)
+    after = time.perf_counter() - start
+
+    print(f"groups={args.groups} repeat={args.repeat}")
+    print(f"before (previous Gene constructor): {before / args.repeat * 1e6:8.2f} us/gene")
+    print(f"after  (precomputed template):      {after / args.repeat * 1e6:8.2f} us/gene")
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
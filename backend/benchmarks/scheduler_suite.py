@@ -0,0 +1,181 @@
+"""Timetable solver benchmark suite.
+
+Times each stage of a solve on synthetic workloads (see workload.py):
+InputData parsing (file and in-memory), TimeTable build, Gene construction,
+Chromosome.get_fitness and full solver runs to feasibility. Runs offline
+(nothing is stored) and writes the results as JSON for comparing runs.
+
+    python benchmarks/scheduler_suite.py --groups 10 30 60 --output results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the app package builds the Flask config, which needs these set.
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("ADMIN_PASSWORD", "benchmark")
+
+from app.algorithm.chromosome import Chromosome
+from app.algorithm.gene import Gene
+from app.algorithm.input_data import InputData
+from app.algorithm.local_search import LocalSearchScheduler
+from app.algorithm.scheduler_main import SchedulerMain
+from app.algorithm.solver_context import SolverContext
+from app.algorithm.time_table import TimeTable
+from app.algorithm.time_table_input_transform_service import transform_input
+
+from workload import generate_payload
+
+
+def time_call(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    # Per-call wall time over `repeat` calls, in microseconds.
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {
+        "repeat": repeat,
+        "mean_us": statistics.mean(samples),
+        "median_us": statistics.median(samples),
+        "min_us": min(samples),
+    }
+
+
+def solve(context: SolverContext, solver: str, args: argparse.Namespace, seed: int) -> Dict[str, Any]:
+    random.seed(seed)
+    context.final_son = None
+    start = time.perf_counter()
+    if solver == "ga":
+        scheduler = SchedulerMain(
+            context,
+            population_size=args.population,
+            max_generations=args.max_generations,
+            time_budget=args.time_budget,
+            greedy_fraction=args.greedy_fraction,
+            fitness_cache_size=args.fitness_cache,
+        )
+        steps = scheduler.generation
+    else:
+        scheduler = LocalSearchScheduler(context, method=solver, time_budget=args.time_budget)
+        steps = scheduler.iteration
+    elapsed = time.perf_counter() - start
+
+    best = scheduler.best
+    return {
+        "solver": solver,
+        "seed": seed,
+        "seconds": elapsed,
+        "solved": context.final_son is not None,
+        "stop_reason": scheduler.stop_reason,
+        "steps": steps,
+        "best_fitness": best.fitness if best else None,
+        "conflicts": best.point // 4000 if best else None,
+        "fitness_cache": scheduler.fitness_cache.stats() if getattr(scheduler, "fitness_cache", None) else None,
+    }
+
+
+def run_workload(groups: int, args: argparse.Namespace) -> Dict[str, Any]:
+    payload = generate_payload(
+        groups=groups,
+        subjects=args.subjects,
+        lab_ratio=args.lab_ratio,
+        unavailability=args.unavailability,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        with contextlib.redirect_stdout(io.StringIO()):
+            transform_input(payload, output_path=path)
+        parse = time_call(lambda: InputData(path), args.repeat)
+    from_payload = time_call(lambda: InputData.from_payload(payload), args.repeat)
+    config = InputData.from_payload(payload)
+
+    context = SolverContext(config)
+    result = {
+        "groups": groups,
+        "teachers": len(config.teacher),
+        "subjects": args.subjects,
+        "input_data_parse": parse,
+        "input_data_from_payload": from_payload,
+        "time_table_build": time_call(lambda: TimeTable(config), args.repeat),
+        "gene_construction": time_call(
+            lambda: Gene(random.randrange(config.nostudentgroup), context), args.repeat * 100
+        ),
+    }
+
+    chromosome = Chromosome(context)
+    result["get_fitness"] = time_call(chromosome.get_fitness, args.repeat * 10)
+
+    runs: List[Dict[str, Any]] = []
+    for solver in args.solvers:
+        for k in range(args.runs):
+            runs.append(solve(context, solver, args, args.seed + k))
+    result["solves"] = runs
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--lab-ratio", type=float, default=0.25)
+    parser.add_argument("--unavailability", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20, help="repetitions of the micro-benchmarks")
+    parser.add_argument("--solvers", nargs="+", default=["ga"], choices=["ga", "annealing", "tabu"])
+    parser.add_argument("--runs", type=int, default=3, help="solver runs per workload (different seeds)")
+    parser.add_argument("--population", type=int, default=200)
+    parser.add_argument("--max-generations", type=int, default=100)
+    parser.add_argument("--greedy-fraction", type=float, default=0.0)
+    parser.add_argument("--fitness-cache", type=int, default=0, help="GA fitness cache entries (0 = off)")
+    parser.add_argument("--time-budget", type=float, default=120.0, help="seconds per solver run")
+    parser.add_argument("--output", default="-", help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": vars(args),
+        "workloads": [],
+    }
+    for groups in args.groups:
+        print(f"groups={groups}", file=sys.stderr)
+        report["workloads"].append(run_workload(groups, args))
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Synthetic timetable workloads.
+
+Generates request payloads in the shape /generate/time-table (and
+transform_input) accepts:
+
+    {"studentgroups": [{"group": ..., "subjects": {subject: hours}}],
+     "teachers": [{"name": ..., "subject": ...}],
+     "teacherunavailability": [{"name": ..., "slots": [...]}]}
+
+    python benchmarks/workload.py --groups 60 --unavailability 0.1 > payload.json
+"""
+import argparse
+import json
+import math
+import random
+import sys
+from typing import Any, Dict
+
+DAYS_PER_WEEK = 5
+HOURS_PER_DAY = 7
+
+
+def generate_payload(
+    groups: int = 30,
+    subjects: int = 8,
+    lab_ratio: float = 0.25,
+    teachers: int = 0,
+    unavailability: float = 0.1,
+    week_fill: float = 0.85,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Returns a random but solvable-looking workload.
+
+    Every group takes the same `subjects` subjects, a `lab_ratio` share of
+    them labs (2-hour blocks), with hours filling about `week_fill` of the
+    week. `teachers` is the total teacher count (0 = just enough for every
+    subject's load with a little slack); each non-lab teacher is
+    unavailable for an `unavailability` share of the week.
+    """
+    rng = random.Random(seed)
+    total_slots = DAYS_PER_WEEK * HOURS_PER_DAY
+
+    lab_count = min(subjects, int(round(subjects * lab_ratio)))
+    names = [f"Subject{k}" for k in range(subjects - lab_count)]
+    names += [f"Subject{k}_lab" for k in range(subjects - lab_count, subjects)]
+
+    # Labs take 2 hours; the other subjects share the rest of the target load.
+    lectures = [name for name in names if not name.endswith("_lab")]
+    budget = max(len(lectures), int(total_slots * week_fill) - 2 * lab_count)
+    hours = {}
+    for i, name in enumerate(lectures):
+        hours[name] = budget // len(lectures) + (1 if i < budget % len(lectures) else 0)
+    for name in names[len(lectures):]:
+        hours[name] = 2
+
+    # Teachers per subject in proportion to its weekly load across groups.
+    load = {name: groups * hours[name] for name in names}
+    minimum = {name: max(1, math.ceil(load[name] / (total_slots * 0.8))) for name in names}
+    per_subject = dict(minimum)
+    if teachers > sum(minimum.values()):
+        total_load = sum(load.values())
+        for name in names:
+            per_subject[name] = max(minimum[name], round(teachers * load[name] / total_load))
+
+    teacher_list = []
+    for name in names:
+        for k in range(per_subject[name]):
+            teacher_list.append({"name": f"{name}_T{k}", "subject": name})
+
+    unavailable_count = int(total_slots * unavailability)
+    unavailability_list = []
+    if unavailable_count:
+        for teacher in teacher_list:
+            if teacher["subject"].endswith("_lab"):
+                continue
+            unavailability_list.append({
+                "name": teacher["name"],
+                "slots": sorted(rng.sample(range(total_slots), unavailable_count)),
+            })
+
+    return {
+        "studentgroups": [
+            {"group": f"Group{g}", "subjects": dict(hours)} for g in range(groups)
+        ],
+        "teachers": teacher_list,
+        "teacherunavailability": unavailability_list,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=30)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--lab-ratio", type=float, default=0.25)
+    parser.add_argument("--teachers", type=int, default=0, help="total teachers (0 = derived from the load)")
+    parser.add_argument("--unavailability", type=float, default=0.1, help="share of the week each teacher is unavailable")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payload = generate_payload(
+        groups=args.groups,
+        subjects=args.subjects,
+        lab_ratio=args.lab_ratio,
+        teachers=args.teachers,
+        unavailability=args.unavailability,
+        seed=args.seed,
+    )
+    json.dump(payload, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental chromosome fitness.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+# Importing the app package builds the Flask config, which needs these set.
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("ADMIN_PASSWORD", "test")
+
+from app.algorithm.chromosome import Chromosome
+from app.algorithm.gene import Gene
+from app.algorithm.input_data import InputData
+from app.algorithm.solver_context import SolverContext
+
+
+def _context():
+    # One teacher per subject for six groups, so random timetables clash.
+    subjects = {"Math": 5, "Physics": 4, "English": 3, "Physics_lab": 2}
+    data = {
+        "studentgroups": [{"group": f"G{i}", "subjects": subjects} for i in range(6)],
+        "teachers": [
+            {"name": "Asha", "subject": "Math"},
+            {"name": "Ravi", "subject": "Physics"},
+            {"name": "Meera", "subject": "English"},
+            {"name": "Lab", "subject": "Physics_lab"},
+        ],
+        "teacherunavailability": [
+            {"name": "Asha", "slots": [0, 1, 2, 3]},
+            {"name": "Meera", "slots": [10, 11]},
+        ],
+    }
+    return SolverContext(InputData.from_payload(data))
+
+
+def _random_moves(context, c, moves):
+    for _ in range(moves):
+        g = random.randrange(c.nostgrp)
+        if random.random() < 0.5:
+            c.swap_slots(g, random.randrange(c.total_slots), random.randrange(c.total_slots))
+        else:
+            c.replace_gene(g, Gene(g, context).slotno)
+
+
+def test_incremental_point_matches_full_rebuild():
+    """replace_gene and swap_slots keep point equal to a full get_fitness."""
+    random.seed(7)
+    context = _context()
+    c = Chromosome(context)
+
+    for _ in range(300):
+        _random_moves(context, c, 1)
+        rebuilt = c.deep_clone()
+        rebuilt.get_fitness()
+        assert c.point == rebuilt.point
+        assert c.fitness == rebuilt.fitness
+        assert c.occupancy == rebuilt.occupancy
+    assert c.point > 0
+
+
+def test_kernel_points_match_python_engine():
+    """The numpy PopulationKernel scores like Chromosome.get_fitness."""
+    pytest.importorskip("numpy")
+    from app.algorithm.population_kernel import PopulationKernel
+
+    random.seed(11)
+    context = _context()
+    population = []
+    for _ in range(20):
+        c = Chromosome(context)
+        _random_moves(context, c, 10)
+        population.append(c)
+    expected = [(c.point, c.occupancy[:]) for c in population]
+
+    kernel = PopulationKernel(context)
+    assert kernel.points(kernel.to_array(population)).tolist() == [point for point, _ in expected]
+    kernel.evaluate_chromosomes(population)
+    assert [(c.point, c.occupancy) for c in population] == expected
+
+
+if __name__ == "__main__":
+    test_incremental_point_matches_full_rebuild()
+    test_kernel_points_match_python_engine()
+    print("All tests passed")
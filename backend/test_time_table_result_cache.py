@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the timetable result cache key.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+# Importing the app package builds the Flask config, which needs these set.
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("ADMIN_PASSWORD", "test")
+
+from app.algorithm.input_data import InputData
+from app.algorithm.time_table_input_transform_service import render_input
+from app.algorithm.time_table_result_cache import canonical_input_key
+
+
+def _payload(teachers, unavailability):
+    return {
+        "studentgroups": [
+            {"group": "G1", "subjects": {"Math": 3}},
+            {"group": "G2", "subjects": {"Math": 3}},
+        ],
+        "teachers": teachers,
+        "teacherunavailability": unavailability,
+    }
+
+
+def _assignments(data):
+    config = InputData.from_payload(data)
+    return [config.teacher[sg.teacher_id[0]].name for sg in config.student_group]
+
+
+def test_teacher_order_changes_key():
+    """Teacher order decides assignment, so it must change the key."""
+    a = {"name": "A", "subject": "Math"}
+    b = {"name": "B", "subject": "Math"}
+    unavailability = [{"name": "A", "slots": [0, 1, 2]}]
+    first = _payload([a, b], unavailability)
+    second = _payload([b, a], unavailability)
+
+    assert _assignments(first) != _assignments(second)
+    assert canonical_input_key("\n".join(render_input(first))) != canonical_input_key("\n".join(render_input(second)))
+
+
+def test_unavailability_order_keeps_key():
+    """Unavailability order doesn't change the problem."""
+    teachers = [{"name": "A", "subject": "Math"}, {"name": "B", "subject": "Math"}]
+    first = _payload(teachers, [{"name": "A", "slots": [0]}, {"name": "B", "slots": [1]}])
+    second = _payload(teachers, [{"name": "B", "slots": [1]}, {"name": "A", "slots": [0]}])
+
+    assert canonical_input_key("\n".join(render_input(first))) == canonical_input_key("\n".join(render_input(second)))
+
+
+if __name__ == "__main__":
+    test_teacher_order_changes_key()
+    test_unavailability_order_keeps_key()
+    print("All tests passed")